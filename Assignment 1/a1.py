@@ -1,4 +1,205 @@
 from a1_support import *
+from itertools import chain
+import sys
+
+
+# Single byte codes used to store the non-ascii game characters in a Board
+BOARD_CODES = {FLAG: "F", POKEMON: "P"}
+BOARD_CHARACTERS = str.maketrans({code: char for char, code in BOARD_CODES.items()})
+CELL_CHARACTERS = tuple(chr(code).translate(BOARD_CHARACTERS) for code in range(128))
+EXPOSED_CODE = ord(EXPOSED)
+# Outcomes of an action played by play_action or run_batch
+PLAYING = "playing"
+GAME_WON = "won"
+GAME_LOST = "lost"
+INVALID_ACTION = "invalid"
+QUIT = "quit"
+UNEXPOSED_CODE = ord(UNEXPOSED)
+FLAG_CODE = ord(BOARD_CODES[FLAG])
+
+
+class Board(object):
+    """
+    A mutable game board which stores one byte per cell in a bytearray.
+
+    Cells are edited in place, so changing a cell no longer copies the whole
+    game string. The board is only turned back into a game string when it
+    needs to be displayed.
+
+    The board keeps running counts of its unexposed cells, its flags and the
+    flags placed on pokemons, so checking for a win does not scan the board.
+    """
+    def __init__(self, grid_size, pokemon_locations=(), game=None):
+        """
+        Parameters:
+            grid_size (int): Size of game.
+            pokemon_locations (PokemonLocations|tuple<int, ...>): All Pokemon's locations.
+            game (str): Game string to load into the board. Defaults to a
+                        board of unexposed cells.
+        """
+        self._grid_size = grid_size
+        self._pokemon_locations = pokemon_locations
+        if game is None:
+            game = UNEXPOSED * grid_size ** 2
+        self._cells = bytearray(game.translate(str.maketrans(BOARD_CODES)), "ascii")
+        self._unexposed = self._cells.count(UNEXPOSED_CODE)
+        self._flags = self._cells.count(FLAG_CODE)
+        self._found = sum(1 for index in pokemon_locations if self._cells[index] == FLAG_CODE)
+
+    def get_grid_size(self):
+        """
+        Returns:
+            (int): Size of game.
+        """
+        return self._grid_size
+
+    def count(self, character):
+        """
+        Parameters:
+            character (str): Character to count.
+
+        Returns:
+            (int): Number of cells holding the character.
+        """
+        if character == UNEXPOSED:
+            return self._unexposed
+        elif character == FLAG:
+            return self._flags
+        return self._cells.count(ord(BOARD_CODES.get(character, character)))
+
+    def is_won(self, pokemon_locations):
+        """
+        Returns True if every cell is exposed or flagged and the flags are on
+        exactly the pokemons.
+
+        Parameters:
+            pokemon_locations (PokemonLocations|tuple<int, ...>): All Pokemon's locations.
+
+        Returns:
+            (bool): True if game is won, False if not yet won.
+        """
+        if self._unexposed or self._flags != len(pokemon_locations):
+            return False
+        if pokemon_locations is self._pokemon_locations:
+            return self._found == self._flags
+        return all(self._cells[index] == FLAG_CODE for index in pokemon_locations)
+
+    def _update(self, index, code):
+        """
+        Writes a cell and updates the running counts for the change.
+
+        Parameters:
+            index (int): Index of cell in the game string.
+            code (int): New byte code of the cell.
+        """
+        old_code = self._cells[index]
+        if old_code == UNEXPOSED_CODE:
+            self._unexposed -= 1
+        elif old_code == FLAG_CODE:
+            self._flags -= 1
+            if index in self._pokemon_locations:
+                self._found -= 1
+        if code == UNEXPOSED_CODE:
+            self._unexposed += 1
+        elif code == FLAG_CODE:
+            self._flags += 1
+            if index in self._pokemon_locations:
+                self._found += 1
+        self._cells[index] = code
+
+    def __getitem__(self, index):
+        return CELL_CHARACTERS[self._cells[index]]
+
+    def __setitem__(self, index, character):
+        self._update(index, ord(BOARD_CODES.get(str(character), str(character))))
+
+    def expose(self, revealed):
+        """
+        Writes the numbers of a whole revealed region into the board at once.
+
+        Parameters:
+            revealed (list<tuple<int, int>>): Index and number of each revealed cell.
+        """
+        for index, number in revealed:
+            self._update(index, EXPOSED_CODE + number)
+
+    def __contains__(self, character):
+        if character == UNEXPOSED:
+            return self._unexposed > 0
+        elif character == FLAG:
+            return self._flags > 0
+        return ord(BOARD_CODES.get(character, character)) in self._cells
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __str__(self):
+        return self._cells.decode("ascii").translate(BOARD_CHARACTERS)
+
+
+class SparseBoard(Board):
+    """
+    A board for grids too large to store every cell, which only stores the
+    exposed and flagged cells.
+
+    Memory use grows with the number of cells played, not the size of the grid.
+    """
+    def __init__(self, grid_size, pokemon_locations=()):
+        """
+        Parameters:
+            grid_size (int): Size of game.
+            pokemon_locations (PokemonLocations|tuple<int, ...>): All Pokemon's locations.
+        """
+        self._grid_size = grid_size
+        self._pokemon_locations = pokemon_locations
+        self._cells = SparseCells()
+        self._unexposed = grid_size ** 2
+        self._flags = 0
+        self._found = 0
+
+    def count(self, character):
+        """
+        Parameters:
+            character (str): Character to count.
+
+        Returns:
+            (int): Number of cells holding the character.
+        """
+        if character in (UNEXPOSED, FLAG):
+            return super().count(character)
+        code = ord(BOARD_CODES.get(character, character))
+        return sum(1 for stored in self._cells.values() if stored == code)
+
+    def __contains__(self, character):
+        return self.count(character) > 0
+
+    def __len__(self):
+        return self._grid_size ** 2
+
+    def __str__(self):
+        return "".join(self[index] for index in range(len(self)))
+
+
+class SparseCells(dict):
+    """Byte codes of the stored cells of a SparseBoard. Missing cells are unexposed."""
+    def __missing__(self, index):
+        return UNEXPOSED_CODE
+
+
+def new_board(grid_size, pokemon_locations=()):
+    """
+    Returns an unexposed board for a game, which is sparse for large grids.
+
+    Parameters:
+        grid_size (int): Size of game.
+        pokemon_locations (PokemonLocations|tuple<int, ...>): All Pokemon's locations.
+
+    Returns:
+        (Board): The new board.
+    """
+    if is_large_grid(grid_size):
+        return SparseBoard(grid_size, pokemon_locations)
+    return Board(grid_size, pokemon_locations)
 
 
 def main():
@@ -23,7 +224,7 @@ def main():
     game_over = False
     #request size of the game
     grid_size = int(input("Please input the size of the grid: "))
-    while grid_size <= 0 or grid_size > 26:
+    while grid_size <= 0:
         grid_size = int(input("Please input the size of the grid: "))
     #request number of Pokemon
     number_of_pokemons = int(input("Please input the number of pokemons: "))
@@ -31,10 +232,12 @@ def main():
         number_of_pokemons = int(input("Please input the number of pokemons: "))
      
     my_pokemon = generate_pokemons(grid_size, number_of_pokemons)
-    game = UNEXPOSED * grid_size**2
+    game = new_board(grid_size, my_pokemon)
+    # Large boards only show the part of the grid around the last action
+    last_index = 0
 
     while game_over == False:
-        display_game(game, grid_size)
+        display_game(game, grid_size, viewport_around(last_index, grid_size))
         action = str(input("\nPlease input action: "))
         # Player asks for help
         if action == 'h': 
@@ -56,68 +259,194 @@ def main():
         # Player asks to reset    
         elif action == ':)':
             print("It's rewind time.")
-            game = UNEXPOSED * grid_size**2
             my_pokemon = generate_pokemons(grid_size, number_of_pokemons)
+            game = new_board(grid_size, my_pokemon)
 
-        # Player asks to flag / unflag a cell
-        elif action[0:2] == 'f ':
-            flag_position = parse_position(action[2:], grid_size)
-            if flag_position is not None:
-                flag_index = position_to_index(flag_position, grid_size)
-                game = flag_cell(game, flag_index)
-                # check if won
-                if check_win(game, my_pokemon):
-                    game_over = True
-                    display_game(game, grid_size)
-                    print("You win.")
-                    return
-                # If not won, repeat asking for an action
-                else:
-                    game_over = False
-            else:
+        # Player asks to flag / unflag or expose a cell
+        else:
+            game, index, outcome = play_action(game, grid_size, my_pokemon, action)
+            if index is not None:
+                last_index = index
+            if outcome == INVALID_ACTION:
                 print(INVALID)
-                game_over = False
-                
-        # Player asks to expose a cell
-        elif action != "" and parse_position(action, grid_size) is not None:
-            position_entered = parse_position(action, grid_size) 
-            position_index = position_to_index(position_entered, grid_size) 
-            # If the position index is flagged, do nothing
-            if game[position_index] == FLAG:
-                game_over = False
-            # If position index is a Pokemon - game lost and expose pokemon
-            elif position_index in my_pokemon:
-                for pokemon_index in my_pokemon: 
-                        game = replace_character_at_index(game, pokemon_index, POKEMON)
-                display_game(game, grid_size)
-                print("You have scared away all the pokemons.")
+            elif outcome == GAME_WON:
                 game_over = True
+                display_game(game, grid_size, viewport_around(last_index, grid_size))
+                print("You win.")
+                return
+            elif outcome == GAME_LOST:
+                game_over = True
+                display_game(game, grid_size, viewport_around(last_index, grid_size))
+                print("You have scared away all the pokemons.")
                 return
-            # Build list of index and neighbours to expose
-            cells_to_expose = big_fun_search(game, grid_size, my_pokemon, position_index) 
-            # If the big_fun_search returned list didn't include our cell, add it in
-            if position_index not in cells_to_expose:
-                cells_to_expose.append(position_index)
-            # Loop through list and expose all cells 
-            for cell_index in cells_to_expose:
-                char_to_expose = number_at_cell(game, my_pokemon, grid_size, cell_index)
-                # If it's a pokemon, replace the cell index with the pokemon character
-                if cell_index in my_pokemon: 
-                    char_to_expose = POKEMON
-                # If the cell isn't exposed yet, expose it; otherwise, move on
-                if game[cell_index] == "~": 
-                    game = replace_character_at_index(game, cell_index, char_to_expose)
-                if check_win(game, my_pokemon):
-                    game_over = True
-                    display_game(game, grid_size)
-                    print("You win.")
-                    return               
-                else:
-                    game_over = False
-        else:            
-            print(INVALID)
     return
-  
+
+
+def play_action(game, grid_size, pokemon_locations, action):
+    """
+    Applies a flag action (e.g. 'f A1') or an expose action (e.g. 'A1') to the game.
+
+    Nothing is printed, so this is shared by main() and the batch mode.
+
+    Parameters:
+        game (str|Board): Game string or board.
+        grid_size (int): Size of game.
+        pokemon_locations (PokemonLocations|tuple<int, ...>): All Pokemon's locations.
+        action (str): Input to be actioned.
+
+    Returns:
+        (tuple<str|Board, int, str>): The updated game, the index of the selected
+            cell (None if the action is invalid) and the outcome, which is one of
+            GAME_WON, GAME_LOST, INVALID_ACTION or PLAYING.
+    """
+    # Player asks to flag / unflag a cell
+    if action[0:2] == 'f ':
+        flag_position = parse_position(action[2:], grid_size)
+        if flag_position is None:
+            return game, None, INVALID_ACTION
+        index = position_to_index(flag_position, grid_size)
+        game = flag_cell(game, index)
+
+    # Player asks to expose a cell
+    else:
+        position = parse_position(action, grid_size)
+        if position is None:
+            return game, None, INVALID_ACTION
+        index = position_to_index(position, grid_size)
+        # If the position index is flagged, do nothing
+        if game[index] == FLAG:
+            return game, index, PLAYING
+        # If position index is a Pokemon - game lost and expose pokemon
+        if index in pokemon_locations:
+            for pokemon_index in pokemon_locations:
+                game = replace_character_at_index(game, pokemon_index, POKEMON)
+            return game, index, GAME_LOST
+        # Find the cell and its neighbours to expose, then expose them all at once
+        game = expose_cells(game, flood_reveal(game, grid_size, pokemon_locations, index))
+
+    if check_win(game, pokemon_locations):
+        return game, index, GAME_WON
+    return game, index, PLAYING
+
+
+def run_batch(lines, show_moves=False, output=sys.stdout):
+    """
+    Plays recorded sessions without asking for input or displaying the game.
+
+    Each session starts with a line holding a seed, the grid size and the number
+    of pokemons (e.g. '42 10 15'), followed by one action per line in the same
+    form as main() accepts. Sessions are separated by blank lines, and lines
+    starting with '#' are ignored. A session stops at a win, a loss or 'q', and
+    ':)' restarts it with new pokemons from the same seed. A session whose first
+    line can not be read is reported as invalid and its actions are skipped.
+
+    For each session one line is written with the session number, the outcome,
+    the number of actions played and the final game string. With show_moves, a
+    line with the session number, action and outcome is written for every
+    action instead.
+
+    Parameters:
+        lines (iterable<str>): Lines of the recorded sessions.
+        show_moves (bool): Whether to write the outcome of every action.
+        output (file): Where the results are written.
+
+    Returns:
+        (dict<str, int>): Number of sessions with each outcome.
+    """
+    totals = {}
+    sessions = 0
+    # The outcome of the session being played, or None between sessions
+    outcome = None
+    # A blank line is added so the last session is finished like the others
+    for line in chain(lines, [""]):
+        line = line.rstrip("\n")
+        if line.startswith("#"):
+            continue
+
+        # Finish the session being played
+        if line == "":
+            if outcome is not None:
+                if not show_moves:
+                    output.write(f"{sessions} {outcome} {moves} {game}\n")
+                totals[outcome] = totals.get(outcome, 0) + 1
+                outcome = None
+            continue
+
+        # Start a new session from its seed and board parameters
+        if outcome is None:
+            sessions += 1
+            moves = 0
+            header = parse_session_header(line)
+            if header is None:
+                game = ""
+                outcome = INVALID_ACTION
+                if show_moves:
+                    output.write(f"{sessions} {line} {outcome}\n")
+                continue
+            seed, grid_size, number_of_pokemons = header
+            rng = random.Random(seed)
+            pokemon_locations = generate_pokemons(grid_size, number_of_pokemons, rng)
+            game = new_board(grid_size, pokemon_locations)
+            outcome = PLAYING
+            continue
+
+        # Ignore the rest of a session once it is over
+        if outcome != PLAYING:
+            continue
+        moves += 1
+        if line == 'q':
+            outcome = QUIT
+        elif line == ':)':
+            pokemon_locations = generate_pokemons(grid_size, number_of_pokemons, rng)
+            game = new_board(grid_size, pokemon_locations)
+        elif line != 'h':
+            game, _, outcome = play_action(game, grid_size, pokemon_locations, line)
+        if show_moves:
+            output.write(f"{sessions} {line} {outcome}\n")
+        # Invalid actions are skipped, as main() would ask for another
+        if outcome == INVALID_ACTION:
+            outcome = PLAYING
+    return totals
+
+
+def parse_session_header(line):
+    """
+    Reads the first line of a recorded session. If the line is not a seed, a
+    grid size and a number of pokemons that fit on the grid, nothing is returned.
+
+    Parameters:
+        line (str): The first line of the session, e.g. '42 10 15'.
+
+    Returns:
+        (tuple<int, int, int>): The seed, grid size and number of pokemons.
+    """
+    try:
+        seed, grid_size, number_of_pokemons = (int(value) for value in line.split())
+    except ValueError:
+        return
+    if grid_size < 1 or not 0 <= number_of_pokemons <= grid_size ** 2:
+        return
+    return seed, grid_size, number_of_pokemons
+
+
+def batch_main(args):
+    """
+    Runs recorded sessions from a file or stdin, as described in run_batch.
+
+    Parameters:
+        args (list<str>): Command line arguments after '--batch': an optional
+                          file name ('-' for stdin) and '--moves' to write
+                          the outcome of every action.
+    """
+    show_moves = "--moves" in args
+    files = [arg for arg in args if arg != "--moves"]
+    if files and files[0] != "-":
+        with open(files[0], encoding="utf-8") as lines:
+            totals = run_batch(lines, show_moves)
+    else:
+        totals = run_batch(sys.stdin, show_moves)
+    sys.stderr.write(" ".join(f"{outcome}={count}" for outcome, count in sorted(totals.items())) + "\n")
+
 
 def big_fun_search(game, grid_size, pokemon_locations, index):
     """Searching adjacent cells to see if there are any Pokemon"s present.
@@ -135,7 +464,7 @@ def big_fun_search(game, grid_size, pokemon_locations, index):
     only the cell itself is revealed.
 
     Parameters:
-            game (str): Game string.
+            game (str|Board): Game string or board.
             grid_size (int): Size of game.
             pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
 
@@ -143,7 +472,9 @@ def big_fun_search(game, grid_size, pokemon_locations, index):
             (list<int>): List of cells to turn visible.
     """
     queue = [index]
-    discovered = [index]
+    # Marks the cells already searched, one byte per cell
+    discovered = new_bitmap(grid_size)
+    discovered[index] = 1
     visible = []
 
     if game[index] == FLAG:
@@ -153,13 +484,14 @@ def big_fun_search(game, grid_size, pokemon_locations, index):
     if number != 0:
             return queue
 
+    neighbours = neighbour_table(grid_size)
     while queue:
             node = queue.pop()
-            for neighbour in neighbour_directions(node, grid_size):
-                    if neighbour in discovered or neighbour is None:
+            for neighbour in neighbours[node]:
+                    if discovered[neighbour]:
                             continue
 
-                    discovered.append(neighbour)
+                    discovered[neighbour] = 1
                     if game[neighbour] != FLAG:
                             number = number_at_cell(game, pokemon_locations, grid_size, neighbour)
                             if number == 0:
@@ -168,7 +500,73 @@ def big_fun_search(game, grid_size, pokemon_locations, index):
     return visible
 
 
-def display_game(game, grid_size):
+def flood_reveal(game, grid_size, pokemon_locations, index):
+    """
+    Finds the cells exposed by selecting a cell, along with their numbers, in one pass.
+
+    The search is the same as big_fun_search, but the selected cell is included
+    and only unexposed cells are returned, so the result can be written into the
+    game in one go with expose_cells.
+
+    Parameters:
+        game (str|Board): Game string or board.
+        grid_size (int): Size of game.
+        pokemon_locations (PokemonLocations|tuple<int, ...>): All Pokemon's locations.
+        index (int): Index of the selected cell.
+
+    Returns:
+        (list<tuple<int, int>>): Index and number of each cell to expose.
+    """
+    if game[index] == FLAG:
+        return []
+    number = number_at_cell(game, pokemon_locations, grid_size, index)
+    revealed = [(index, number)] if game[index] == UNEXPOSED else []
+    if number != 0:
+        return revealed
+
+    neighbours = neighbour_table(grid_size)
+    discovered = new_bitmap(grid_size)
+    discovered[index] = 1
+    queue = [index]
+    while queue:
+        node = queue.pop()
+        for neighbour in neighbours[node]:
+            if discovered[neighbour]:
+                continue
+            discovered[neighbour] = 1
+            if game[neighbour] == FLAG:
+                continue
+            number = number_at_cell(game, pokemon_locations, grid_size, neighbour)
+            if number == 0:
+                queue.append(neighbour)
+            if game[neighbour] == UNEXPOSED:
+                revealed.append((neighbour, number))
+    return revealed
+
+
+def expose_cells(game, revealed):
+    """
+    Returns the game with a whole revealed region exposed in one update.
+
+    A Board is updated in place and returned.
+
+    Parameters:
+        game (str|Board): Game string or board.
+        revealed (list<tuple<int, int>>): Index and number of each cell to expose.
+
+    Returns:
+        (str|Board): A game which has been updated for the exposed cells.
+    """
+    if isinstance(game, Board):
+        game.expose(revealed)
+        return game
+    cells = list(game)
+    for index, number in revealed:
+        cells[index] = str(number)
+    return "".join(cells)
+
+
+def display_game(game, grid_size, viewport=None):
     """
     Prints out a grid-shaped representation of the game, given the game string
     and the grid size as arguments.
@@ -181,29 +579,81 @@ def display_game(game, grid_size):
     the row identifier, it prints the characters in the game string which fall
     within that row (with respect to the grid size).
 
+    The whole frame is built first and written to the screen at once.
+
     Parameters:
-        game (str): Game string.
+        game (str|Board): Game string or board.
         grid_size (int): Size of game.
+        viewport (tuple<range, range>): Rows and columns to show. Shows the
+                                        whole grid when not given.
     """
-    for row in range(grid_size+1):
-        if row == 0:
-            print(" ", end="")
-            for col in range(grid_size):
-                if col < 10:
-                    print(' | ' + str(col+1), end="")
-                else:
-                    print('| ' + str(col+1), end="")
-            if col < 10:
-                print(' |\n', end="")
-            else:
-                print('|\n', end="")
-            print("-" *((4*grid_size)+4))
-        else:
-            print(ALPHA[row-1], end="")
-            for index in range(grid_size):
-                print(" | "  + game[grid_size * (row-1) + index], end="")
-            print(" |\n", end="")
-            print("-" *((4*grid_size)+4))
+    sys.stdout.write(render_game(game, grid_size, viewport))
+    sys.stdout.flush()
+
+
+def render_game(game, grid_size, viewport=None):
+    """
+    Returns the text of one frame of display_game.
+
+    Only the cells inside the viewport are read, so a small window of a very
+    large board is cheap to render. Whole boards of up to 26 rows are drawn
+    exactly as before; larger boards and viewports widen their columns to fit
+    the column numbers.
+
+    Parameters:
+        game (str|Board): Game string or board.
+        grid_size (int): Size of game.
+        viewport (tuple<range, range>): Rows and columns to show. Shows the
+                                        whole grid when not given.
+
+    Returns:
+        (str): The frame, with one line per row and divider.
+    """
+    if viewport is None:
+        viewport = (range(grid_size), range(grid_size))
+    rows, cols = viewport
+    # Columns widen once their numbers need more than three characters
+    width = max(3, len(str(cols[-1] + 1)) + 1)
+    label_width = len(row_label(rows[-1]))
+    divider = "-" * (label_width + 3 + len(cols) * (width + 1))
+
+    header = (" " * label_width + " "
+              + "".join("|" + (" " + str(col + 1)).ljust(width) for col in cols) + "|")
+    if grid_size <= len(ALPHA) and viewport == (range(grid_size), range(grid_size)):
+        # Whole boards of up to 26 rows keep the original header, which has a
+        # space after the number of column 10 when it is the last column
+        header = (" " + "".join((" | " if col < 10 else "| ") + str(col + 1) for col in cols)
+                  + (" |" if cols[-1] < 10 else "|"))
+    lines = [header, divider]
+    for row in rows:
+        start = row * grid_size
+        lines.append(row_label(row).ljust(label_width) + " "
+                     + "".join("|" + (" " + game[start + col]).ljust(width) for col in cols)
+                     + "|")
+        lines.append(divider)
+    lines.append("")
+    return "\n".join(lines)
+
+
+def viewport_around(index, grid_size, size=VIEWPORT_SIZE):
+    """
+    Returns the rows and columns of a window of the grid centred on a cell.
+
+    Parameters:
+        index (int): Index of the cell to centre on, usually the last action.
+        grid_size (int): Size of game.
+        size (int): Number of rows and columns in the window.
+
+    Returns:
+        (tuple<range, range>): Rows and columns to show, or None if the whole
+                               grid fits in the window.
+    """
+    if grid_size <= size:
+        return None
+    row, col = divmod(index, grid_size)
+    first_row = min(max(row - size // 2, 0), grid_size - size)
+    first_col = min(max(col - size // 2, 0), grid_size - size)
+    return (range(first_row, first_row + size), range(first_col, first_col + size))
 
 
 def parse_position(action, grid_size):
@@ -220,14 +670,17 @@ def parse_position(action, grid_size):
         (tuple(int, int)): position (tuple(int, int)): Tuple of the row and column
                            position of a cell within the game grid.
     """
-    grid_alpha = ALPHA[:grid_size] 
     if(action == ""):
         return
 
-    action_row = action[0] 
-    action_col = action[1:] 
-    if action_row in grid_alpha and action_col.isdigit() and 0 < int(action_col) <= grid_size:
-        return((grid_alpha.index(action_row),int(action_col) - 1))
+    # Rows past Z are named with more than one letter (AA, AB, ...)
+    action_row = action.rstrip("0123456789")
+    action_col = action[len(action_row):]
+    if action_row == "" or action_col == "" or not all(letter in ALPHA for letter in action_row):
+        return
+    row = label_to_row(action_row)
+    if row < grid_size and 0 < int(action_col) <= grid_size:
+        return((row, int(action_col) - 1))
     else: 
         return
  
@@ -256,14 +709,19 @@ def replace_character_at_index(game, index, character):
     Returns an updated game string with a specified character at a specified index of
     the game string.
 
+    A Board is updated in place and returned.
+
     Parameters:
-        game (str): Game string.
+        game (str|Board): Game string or board.
         index (int): Index of cell in the game string.
         character (str): Character which replaces another in the game string.
 
     Returns:
-        (str): A game string which has been updated for the new character.
+        (str|Board): A game which has been updated for the new character.
     """
+    if isinstance(game, Board):
+        game[index] = character
+        return game
     game_before_index = game[:index] 
     game_after_index = game[index+1:] 
     game = game_before_index + str(character) + game_after_index 
@@ -275,13 +733,21 @@ def flag_cell(game, index):
     Toggles a flag character on / off at a specified index within the game string.
     The game string is updated for the toggled flag.
 
+    A Board is updated in place and returned.
+
     Parameters:
-        game (str): Game string.
+        game (str|Board): Game string or board.
         index (int): Index of cell in the game string.
 
     Returns:
-        (str): A game string which has been updated for a toggled flag.
+        (str|Board): A game which has been updated for a toggled flag.
     """
+    if isinstance(game, Board):
+        if game[index] == UNEXPOSED:
+            game[index] = FLAG
+        elif game[index] == FLAG:
+            game[index] = UNEXPOSED
+        return game
     #Toggles flag on at unexposed index
     if game[index] == '~':
         game_before_index = game[:index] 
@@ -316,46 +782,15 @@ def index_in_direction(index, grid_size, direction):
     Returns:
         (int): Index of the adjacent cell.
     """
-    if direction == LEFT:
-        if index % grid_size == 0:
-            return None
-        else:
-            return index - 1
-    elif direction == RIGHT:
-        if index % grid_size == grid_size - 1:
-            return None
-        else:
-            return index + 1
-    elif direction == UP:
-        if index < grid_size:
-            return None
-        else:
-            return index - grid_size
-    elif direction == DOWN:
-        if index >= grid_size**2 - grid_size:
-            return None
-        else:
-            return index + grid_size
-    elif direction == f"{UP}-{LEFT}":
-        if index < grid_size or index % grid_size == 0:
-            return None
-        else:
-            return index - grid_size - 1
-    elif direction == f"{UP}-{RIGHT}":
-        if index < grid_size or index % grid_size == grid_size - 1:
-            return None
-        else:
-            return index - grid_size + 1
-    elif direction == f"{DOWN}-{LEFT}":
-        if index >= grid_size**2 - grid_size or index % grid_size == 0:
-            return None
-        else:
-            return index + grid_size - 1
-    elif direction == f"{DOWN}-{RIGHT}":
-        if index >= grid_size**2 - grid_size or index % grid_size == grid_size - 1:
-            return None
-        else:
-            return index + grid_size + 1
+    offset = DIRECTION_OFFSETS.get(direction)
+    if offset is None:
+        return None
+    row, col = divmod(index, grid_size)
+    row += offset[0]
+    col += offset[1]
+    if 0 <= row < grid_size and 0 <= col < grid_size:
+        return row * grid_size + col
+    return None
 
 
 def neighbour_directions(index, grid_size):
@@ -369,30 +804,28 @@ def neighbour_directions(index, grid_size):
     Returns:
         (list[int, ...]): List of indexes which neighbour a specified cell.
         """
-    index_list = []
-    for i in DIRECTIONS:
-        neighbour = index_in_direction(index, grid_size, i) 
-        if neighbour != None: 
-            index_list.append(neighbour) 
-    return index_list
+    return list(neighbour_table(grid_size)[index])
 
 
 def number_at_cell(game, pokemon_locations, grid_size, index):
     """
     Returns the number of Pokemon in neighbouring cells.
 
+    Locations made by generate_pokemons already hold the count for every cell.
+
     Parameters:
         game (str): Game string.
-        pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+        pokemon_locations (PokemonLocations|tuple<int, ...>): All Pokemon's locations.
         grid_size (int): Size of game.
         index (int): Index of cell in the game string.
 
     Returns:
         (int): Number of Pokemon in neighbouring cells.
     """
-    neighbours = neighbour_directions(index, grid_size)
+    if isinstance(pokemon_locations, PokemonLocations):
+        return pokemon_locations.counts[index]
     counter = 0
-    for i in neighbours:
+    for i in neighbour_table(grid_size)[index]:
         if i in pokemon_locations:  
             counter += 1
     return counter
@@ -413,12 +846,15 @@ def check_win(game, pokemon_locations):
     If not, it exits the loop.
     
     Parameters:
-        game (str): Game string.
+        game (str|Board): Game string or board.
         pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.                                          
 
     Returns:
         (bool): True if game is won, False if not yet won.    
     """
+    if isinstance(game, Board):
+        # Boards keep running counts, so they are checked without a scan
+        return game.is_won(pokemon_locations)
     flag_list = []
     # Get indexes of flag chars only and add them to a list
     for index, char in enumerate(game): 
@@ -437,7 +873,10 @@ def check_win(game, pokemon_locations):
         return False # Flag list is too big or small 
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:2] == ["--batch"]:
+        batch_main(sys.argv[2:])
+    else:
+        main()
 
 
 
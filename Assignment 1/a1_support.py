@@ -1,4 +1,10 @@
 import random
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 ALPHA = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
 UP = "up"
@@ -8,6 +14,14 @@ RIGHT = "right"
 DIRECTIONS = (UP, DOWN, LEFT, RIGHT,
               f"{UP}-{LEFT}", f"{UP}-{RIGHT}",
               f"{DOWN}-{LEFT}", f"{DOWN}-{RIGHT}")
+# Row and column offsets of the adjacent cell in each direction
+DIRECTION_OFFSETS = {UP: (-1, 0), DOWN: (1, 0), LEFT: (0, -1), RIGHT: (0, 1),
+                     f"{UP}-{LEFT}": (-1, -1), f"{UP}-{RIGHT}": (-1, 1),
+                     f"{DOWN}-{LEFT}": (1, -1), f"{DOWN}-{RIGHT}": (1, 1)}
+# Grids with more cells than this are stored sparsely and counted lazily
+DENSE_CELL_LIMIT = 2 ** 20
+# Grids larger than this are displayed a window at a time
+VIEWPORT_SIZE = 26
 WALL_VERTICAL = "|"
 WALL_HORIZONTAL = "-"
 POKEMON = "☺"
@@ -16,35 +30,235 @@ UNEXPOSED = "~"
 EXPOSED = "0"
 INVALID = "That ain't a valid action buddy."
 HELP_TEXT = """h - Help.
-<Uppercase Letter><number> - Selecting a cell (e.g. 'A1')
-f <Uppercase Letter><number> - Placing flag at cell (e.g. 'f A1')
+<Uppercase Letters><number> - Selecting a cell (e.g. 'A1', or 'AA1' past row Z)
+f <Uppercase Letters><number> - Placing flag at cell (e.g. 'f A1')
 :) - Restart game.
 q - Quit.
 """
 
 
-def generate_pokemons(grid_size, number_of_pokemons):
-    """Pokemons will be generated and given a random index within the game.
+def is_large_grid(grid_size):
+    """Returns True if a grid is too large to store every cell.
 
     Parameters:
         grid_size (int): The grid size of the game.
-        number_of_pokemons (int): The number of pokemons that the game will have.
 
     Returns:
-        (tuple<int>): A tuple containing  indexes where the pokemons are
-        created for the game string.
+        (bool): True if the grid should be stored sparsely.
     """
-    cell_count = grid_size ** 2
-    pokemon_locations = ()
+    return grid_size ** 2 > DENSE_CELL_LIMIT
+
+
+def row_label(row):
+    """Returns the letters naming a row, continuing A-Z with AA, AB, ...
+
+    Parameters:
+        row (int): The row number, starting from 0.
+
+    Returns:
+        (str): The row's letters.
+    """
+    label = ""
+    row += 1
+    while row > 0:
+        row, letter = divmod(row - 1, len(ALPHA))
+        label = ALPHA[letter] + label
+    return label
+
+
+def label_to_row(label):
+    """Returns the row number named by some letters. The inverse of row_label.
+
+    Parameters:
+        label (str): The row's letters.
+
+    Returns:
+        (int): The row number, starting from 0.
+    """
+    row = 0
+    for letter in label:
+        row = row * len(ALPHA) + ALPHA.index(letter) + 1
+    return row - 1
+
+
+class LazyNeighbourTable(object):
+    """Neighbour lookups for a grid too large to store a neighbour table.
+
+    The neighbours of a cell are worked out when they are looked up.
+    """
+    def __init__(self, grid_size):
+        """
+        Parameters:
+            grid_size (int): The grid size of the game.
+        """
+        self._grid_size = grid_size
+
+    def __getitem__(self, index):
+        grid_size = self._grid_size
+        row, col = divmod(index, grid_size)
+        return tuple(index + row_offset * grid_size + col_offset
+                     for row_offset, col_offset in DIRECTION_OFFSETS.values()
+                     if 0 <= row + row_offset < grid_size
+                     and 0 <= col + col_offset < grid_size)
+
+
+class LazyCounts(object):
+    """Adjacent pokemon counts for a grid too large to count every cell.
+
+    A cell is counted the first time it is looked up, and the count is kept.
+    """
+    def __init__(self, grid_size, pokemon_locations):
+        """
+        Parameters:
+            grid_size (int): The grid size of the game.
+            pokemon_locations (frozenset<int>): The indexes of the pokemons.
+        """
+        self._neighbours = neighbour_table(grid_size)
+        self._pokemon_locations = pokemon_locations
+        self._counts = {}
+
+    def __getitem__(self, index):
+        count = self._counts.get(index)
+        if count is None:
+            count = sum(1 for neighbour in self._neighbours[index]
+                        if neighbour in self._pokemon_locations)
+            self._counts[index] = count
+        return count
+
+
+class SparseBitmap(set):
+    """A set of marked cells which can be used in place of a bytearray bitmap."""
+    def __getitem__(self, index):
+        return index in self
+
+    def __setitem__(self, index, value):
+        if value:
+            self.add(index)
+        else:
+            self.discard(index)
+
+
+def new_bitmap(grid_size):
+    """Returns an unmarked bitmap with one entry per cell.
+
+    Large grids get a SparseBitmap, which only stores the marked cells.
+
+    Parameters:
+        grid_size (int): The grid size of the game.
+
+    Returns:
+        (bytearray|SparseBitmap): The bitmap.
+    """
+    if is_large_grid(grid_size):
+        return SparseBitmap()
+    return bytearray(grid_size ** 2)
+
+
+@lru_cache(maxsize=None)
+def neighbour_table(grid_size):
+    """Builds the neighbours of every cell in a grid, once per grid size.
+
+    Looking up the neighbours of a cell is then a single index into the table.
+    Large grids get a LazyNeighbourTable instead.
+
+    Parameters:
+        grid_size (int): The grid size of the game.
+
+    Returns:
+        (tuple<tuple<int>>): The indexes neighbouring each cell, in the order
+        of DIRECTIONS.
+    """
+    if is_large_grid(grid_size):
+        return LazyNeighbourTable(grid_size)
+    table = []
+    for index in range(grid_size ** 2):
+        row, col = divmod(index, grid_size)
+        table.append(tuple(index + row_offset * grid_size + col_offset
+                           for row_offset, col_offset in DIRECTION_OFFSETS.values()
+                           if 0 <= row + row_offset < grid_size
+                           and 0 <= col + col_offset < grid_size))
+    return tuple(table)
+
+
+def adjacency_counts(grid_size, pokemon_locations):
+    """Counts the pokemons adjacent to every cell of the game.
+
+    Uses a numpy convolution of the pokemon grid when numpy is installed.
+
+    Parameters:
+        grid_size (int): The grid size of the game.
+        pokemon_locations (iterable<int>): The indexes of the pokemons.
+
+    Returns:
+        (bytearray): The number of adjacent pokemons for each index.
+    """
+    if np is not None:
+        pokemons = np.zeros((grid_size + 2, grid_size + 2), dtype=np.uint8)
+        indexes = np.fromiter(pokemon_locations, dtype=np.int64)
+        pokemons[1 + indexes // grid_size, 1 + indexes % grid_size] = 1
+        counts = np.zeros((grid_size, grid_size), dtype=np.uint8)
+        for row_offset, col_offset in DIRECTION_OFFSETS.values():
+            counts += pokemons[1 + row_offset:1 + row_offset + grid_size,
+                               1 + col_offset:1 + col_offset + grid_size]
+        return bytearray(counts.tobytes())
+
+    # Work out neighbours directly, as a neighbour table is too big for large grids
+    counts = bytearray(grid_size ** 2)
+    for index in pokemon_locations:
+        row, col = divmod(index, grid_size)
+        for row_offset, col_offset in DIRECTION_OFFSETS.values():
+            if 0 <= row + row_offset < grid_size and 0 <= col + col_offset < grid_size:
+                counts[index + row_offset * grid_size + col_offset] += 1
+    return counts
+
+
+class PokemonLocations(frozenset):
+    """The indexes of the pokemons in a game.
+
+    The number of pokemons adjacent to each cell is counted once, when the
+    locations are made, and kept in counts. Large grids count each cell the
+    first time it is needed instead.
+    """
+    def __new__(cls, grid_size, pokemon_locations):
+        """
+        Parameters:
+            grid_size (int): The grid size of the game.
+            pokemon_locations (iterable<int>): The indexes of the pokemons.
+        """
+        self = super().__new__(cls, pokemon_locations)
+        self.grid_size = grid_size
+        if is_large_grid(grid_size):
+            self.counts = LazyCounts(grid_size, self)
+        else:
+            self.counts = adjacency_counts(grid_size, self)
+        return self
 
-    for _ in range(number_of_pokemons):
-        if len(pokemon_locations) >= cell_count:
-            break
-        index = random.randint(0, cell_count-1)
+    def __reduce__(self):
+        return self.__class__, (self.grid_size, tuple(self))
 
-        while index in pokemon_locations:
-            index = random.randint(0, cell_count-1)
 
-        pokemon_locations += (index,)
+def generate_pokemons(grid_size, number_of_pokemons, seed=None):
+    """Pokemons will be generated and given a random index within the game.
+
+    The indexes are sampled without replacement, so this takes linear time
+    however many of the cells hold pokemons.
 
-    return pokemon_locations
+    Parameters:
+        grid_size (int): The grid size of the game.
+        number_of_pokemons (int): The number of pokemons that the game will have.
+        seed (int|random.Random): Seed or random number generator to use, so a
+            game can be reproduced. Uses the random module when not given.
+
+    Returns:
+        (PokemonLocations): The indexes where the pokemons are created for
+        the game string.
+    """
+    if seed is None:
+        rng = random
+    elif isinstance(seed, random.Random):
+        rng = seed
+    else:
+        rng = random.Random(seed)
+    cell_count = grid_size ** 2
+    pokemon_locations = rng.sample(range(cell_count), min(number_of_pokemons, cell_count))
+    return PokemonLocations(grid_size, pokemon_locations)
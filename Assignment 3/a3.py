@@ -6,6 +6,16 @@ import random, os
 from PIL import Image, ImageTk
 import sys
 from tkinter import filedialog
+from functools import lru_cache
+from math import comb
+from collections import OrderedDict
+from array import array
+import mmap
+import struct
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 
@@ -21,42 +31,369 @@ DIRECTIONS = (UP, DOWN, LEFT, RIGHT,
 POKEMON = "☺"
 FLAG = "♥"
 UNEXPOSED = "~"
+#Row and column offsets of the adjacent cell in each direction
+DIRECTION_OFFSETS = {UP: (-1, 0), DOWN: (1, 0), LEFT: (0, -1), RIGHT: (0, 1),
+                     f"{UP}-{LEFT}": (-1, -1), f"{UP}-{RIGHT}": (-1, 1),
+                     f"{DOWN}-{LEFT}": (1, -1), f"{DOWN}-{RIGHT}": (1, 1)}
+#Grids with more cells than this are searched with sparse bitmaps and lazy neighbour lookups
+DENSE_CELL_LIMIT = 2 ** 20
+#Bytes of decoded images kept by the image cache before the least recently used are dropped
+IMAGE_CACHE_BYTES = 16 * 2 ** 20
+
+
+def is_large_grid(grid_size):
+    """Checks if a grid is too large to store something for every cell.
+
+    Parameters:
+        grid_size (int): The grid size of the game.
+
+    Returns:
+        (bool): True if the grid should be handled sparsely.
+    """
+    return grid_size ** 2 > DENSE_CELL_LIMIT
+
+
+class LazyNeighbourTable(object):
+    """Neighbour lookups for a grid too large to store a neighbour table.
+    """
+    def __init__(self, grid_size):
+        """Initializes the LazyNeighbourTable.
+
+        Parameters:
+        grid_size(int): The grid size of the game.
+        """
+        self._grid_size = grid_size
+
+    def __getitem__(self, index):
+        """Works out the neighbours of a cell when they are looked up.
+
+        Parameters:
+            index (int): The index in the game string.
+
+        Returns:
+            (tuple<int>): The neighbouring indices, in the order of DIRECTIONS.
+        """
+        grid_size = self._grid_size
+        row, col = divmod(index, grid_size)
+        return tuple(index + row_offset * grid_size + col_offset
+                     for row_offset, col_offset in DIRECTION_OFFSETS.values()
+                     if 0 <= row + row_offset < grid_size
+                     and 0 <= col + col_offset < grid_size)
+
+
+class LazyCounts(object):
+    """Adjacent pokemon counts for a grid too large to count every cell up front.
+    """
+    def __init__(self, grid_size, pokemon_locations):
+        """Initializes the LazyCounts.
+
+        Parameters:
+        grid_size(int): The grid size of the game.
+        pokemon_locations(frozenset<int>): Index or indices of pokemon locations.
+        """
+        self._neighbours = neighbour_table(grid_size)
+        self._pokemon_locations = pokemon_locations
+        self._counts = {}
+
+    def __getitem__(self, index):
+        """Counts a cell the first time it is looked up and keeps the count.
+
+        Parameters:
+            index (int): The index in the game string.
+
+        Returns:
+            (int): The number of adjacent pokemon.
+        """
+        count = self._counts.get(index)
+        if count is None:
+            count = sum(1 for neighbour in self._neighbours[index]
+                        if neighbour in self._pokemon_locations)
+            self._counts[index] = count
+        return count
+
+
+class SparseBitmap(set):
+    """A set of marked cells which can be used in place of a bytearray bitmap.
+    """
+    def __getitem__(self, index):
+        return index in self
+
+    def __setitem__(self, index, value):
+        if value:
+            self.add(index)
+        else:
+            self.discard(index)
+
+
+def new_bitmap(grid_size):
+    """Creates an unmarked bitmap with one entry per cell. Large grids get a SparseBitmap.
+
+    Parameters:
+        grid_size (int): The grid size of the game.
+
+    Returns:
+        (bytearray|SparseBitmap): The bitmap.
+    """
+    if is_large_grid(grid_size):
+        return SparseBitmap()
+    return bytearray(grid_size ** 2)
+
+
+@lru_cache(maxsize=None)
+def neighbour_table(grid_size):
+    """Builds the neighbours of every cell in a grid, once per grid size.
+
+    Looking up the neighbours of a cell is then a single index into the table.
+    Large grids get a LazyNeighbourTable instead.
+
+    Parameters:
+        grid_size (int): The grid size of the game.
+
+    Returns:
+        (tuple<tuple<int>>): The indices neighbouring each cell, in the order of DIRECTIONS.
+    """
+    if is_large_grid(grid_size):
+        return LazyNeighbourTable(grid_size)
+    table = []
+    for index in range(grid_size ** 2):
+        row, col = divmod(index, grid_size)
+        table.append(tuple(index + row_offset * grid_size + col_offset
+                           for row_offset, col_offset in DIRECTION_OFFSETS.values()
+                           if 0 <= row + row_offset < grid_size
+                           and 0 <= col + col_offset < grid_size))
+    return tuple(table)
+
+
+def adjacency_counts(grid_size, pokemon_locations):
+    """Counts the pokemon adjacent to every cell of the game.
+
+    Uses a numpy convolution of the pokemon grid when numpy is installed.
+
+    Parameters:
+        grid_size (int): The grid size of the game.
+        pokemon_locations (iterable<int>): Index or indices of pokemon locations.
+
+    Returns:
+        (bytearray): The number of adjacent pokemon for each index.
+    """
+    if np is not None:
+        pokemon = np.zeros((grid_size + 2, grid_size + 2), dtype = np.uint8)
+        indices = np.fromiter(pokemon_locations, dtype = np.int64)
+        pokemon[1 + indices // grid_size, 1 + indices % grid_size] = 1
+        counts = np.zeros((grid_size, grid_size), dtype = np.uint8)
+        for row_offset, col_offset in DIRECTION_OFFSETS.values():
+            counts += pokemon[1 + row_offset:1 + row_offset + grid_size,
+                              1 + col_offset:1 + col_offset + grid_size]
+        return bytearray(counts.tobytes())
+
+    #Work out neighbours directly, as a neighbour table is too big for large grids
+    counts = bytearray(grid_size ** 2)
+    for index in pokemon_locations:
+        row, col = divmod(index, grid_size)
+        for row_offset, col_offset in DIRECTION_OFFSETS.values():
+            if 0 <= row + row_offset < grid_size and 0 <= col + col_offset < grid_size:
+                counts[index + row_offset * grid_size + col_offset] += 1
+    return counts
+
+
+def convolve(first, second):
+    """Combines the pokemon count distributions of two independent parts of the board.
+
+    Parameters:
+        first (dict<int, int>): Number of layouts of the first part for each count of pokemon.
+        second (dict<int, int>): Number of layouts of the second part for each count of pokemon.
+
+    Returns:
+        (dict<int, int>): Number of layouts of both parts for each total count of pokemon.
+    """
+    combined = {}
+    for first_count, first_ways in first.items():
+        for second_count, second_ways in second.items():
+            count = first_count + second_count
+            combined[count] = combined.get(count, 0) + first_ways * second_ways
+    return combined
+
+
+def enumerate_component(constraints):
+    """Counts the pokemon layouts which satisfy a component of frontier constraints.
+
+    Cells next to exactly the same numbers are grouped, and each group is given a
+    number of pokemon rather than trying every layout of its cells.
+
+    Parameters:
+        constraints (iterable<tuple<tuple<int>, int>>): Unknown neighbours and number of
+        each exposed cell in the component.
+
+    Returns:
+        (tuple<list<list<int>>, dict<int, tuple<int, list<int>>>>): The groups of cells and,
+        for each total number of pokemon, the number of layouts and the pokemon in each
+        group summed over those layouts.
+    """
+    constraints = list(constraints)
+    memberships = {}
+    for position, (cells, _) in enumerate(constraints):
+        for cell in cells:
+            memberships.setdefault(cell, []).append(position)
+    groups = {}
+    for cell, positions in memberships.items():
+        groups.setdefault(tuple(positions), []).append(cell)
+    #Groups of the earlier constraints go first, so constraints are completed early
+    groups = sorted(groups.items(), key = lambda group: (max(group[0]), min(group[0])))
+    members = [positions for positions, _ in groups]
+    sizes = [len(cells) for _, cells in groups]
+    remaining = [number for _, number in constraints]
+    unassigned = [len(cells) for cells, _ in constraints]
+    pokemon = [0] * len(groups)
+    layouts = {}
+
+    def assign(group, total, ways):
+        if group == len(groups):
+            entry = layouts.setdefault(total, [0, [0] * len(groups)])
+            entry[0] += ways
+            for position, count in enumerate(pokemon):
+                if count:
+                    entry[1][position] += ways * count
+            return
+        size = sizes[group]
+        positions = members[group]
+        for position in positions:
+            unassigned[position] -= size
+        #Each number needs enough pokemon here to be reachable, and cannot be exceeded
+        low = max(0, max(remaining[position] - unassigned[position] for position in positions))
+        high = min(size, min(remaining[position] for position in positions))
+        for count in range(low, high + 1):
+            for position in positions:
+                remaining[position] -= count
+            pokemon[group] = count
+            assign(group + 1, total + count, ways * comb(size, count))
+            for position in positions:
+                remaining[position] += count
+        pokemon[group] = 0
+        for position in positions:
+            unassigned[position] += size
+
+    assign(0, 0, 1)
+    return ([cells for _, cells in groups],
+            {total: (ways, group_pokemon) for total, (ways, group_pokemon) in layouts.items()})
+
 
 class BoardModel(object):
     """
     Stores and manages the internal game state. Represents the model class.
     """
-    def __init__(self, grid_size, num_pokemon):
+    def __init__(self, grid_size, num_pokemon, seed = None, on_change = None):
         """Initializes the BoardModel.
         
         Parameters:
         grid_size(int): The grid size of the game.
         num_pokemon(int): The number of pokemon in the game.
+        seed(int|random.Random): Seed or random number generator used to place the pokemon,
+        so a game can be reproduced. Uses the random module when not given.
+        on_change(callable): Function or method to call with the index and new character
+        of each changed cell, after each operation that changes cells.
         """
+        self._on_change = on_change
         self._grid_size = grid_size
         self._num_pokemon = num_pokemon
-        self._game = UNEXPOSED * grid_size ** 2 
+        if seed is None or isinstance(seed, random.Random):
+            self._rng = seed or random
+        else:
+            self._rng = random.Random(seed)
+        self._game = self.empty_game()
         self._num_pokeballs = 15   
-        self._pokemon_locations = self.generate_pokemons()
+        #Layouts of each frontier component, which only depend on the component's constraints
+        self._component_cache = {}
+        self.set_pokemon_locations(self.generate_pokemons())
        
     def generate_pokemons(self):
         """Pokemons will be generated and given a random index within the game.
 
+        The indexes are sampled without replacement, so this takes linear time
+        however many of the cells hold pokemon.
+
         Returns:
-            (tuple<int>): A tuple containing  indexes where the pokemons are
-            created for the game string.
+            (frozenset<int>): The indexes where the pokemons are created for
+            the game string.
         """
         cell_count = self._grid_size ** 2
-        pokemon_locations = ()
+        return frozenset(self._rng.sample(range(cell_count), min(self._num_pokemon, cell_count)))
 
-        for _ in range(self._num_pokemon):
-            if len(pokemon_locations) >= cell_count:
-                break
-            index = random.randint(0, cell_count-1)
-            while index in pokemon_locations:
-                index = random.randint(0, cell_count-1)
-            pokemon_locations += (index,)
-        return pokemon_locations
+    def empty_game(self):
+        """Creates the game for a game with no cells exposed.
+
+        Returns:
+            (DenseGame): The unexposed game.
+        """
+        return DenseGame(UNEXPOSED * self._grid_size ** 2)
+
+    def set_pokemon_locations(self, pokemon_locations):
+        """Stores the pokemon locations and counts the pokemon adjacent to every cell once.
+
+        Parameters:
+            pokemon_locations (iterable<int>): Index or indices of pokemon locations.
+        """
+        self._pokemon_locations = frozenset(pokemon_locations)
+        self._counts = adjacency_counts(self._grid_size, self._pokemon_locations)
+        #Zero regions are labelled as they are first opened, and kept across restarts
+        self._zero_regions = None
+        self.recount()
+
+    def recount(self):
+        """Counts the unexposed cells, flags and flags placed on pokemon in the game string.
+
+        These counts are then kept up to date as cells change, so the game never
+        has to be scanned to check for a win.
+        """
+        self._num_unexposed = self._game.count(UNEXPOSED)
+        self._num_flags = self._game.count(FLAG)
+        #Checking the length keeps this safe while a loaded game has a different grid size
+        size = len(self._game)
+        self._num_found = sum(1 for i in self._pokemon_locations
+                              if i < size and self._game[i] == FLAG)
+        #The frontier constraints are rebuilt the next time probabilities are asked for
+        self._constraints = None
+        self._touched = set()
+        self._probabilities = None
+
+    def count_cell(self, index, character, change):
+        """Adds a change to the running counts for the character at index.
+
+        Parameters:
+            index (int): Index of the cell.
+            character (str): The character being added to or removed from the cell.
+            change (int): 1 if the character is added, -1 if it is removed.
+        """
+        if character == UNEXPOSED:
+            self._num_unexposed += change
+        elif character == FLAG:
+            self._num_flags += change
+            if index in self._pokemon_locations:
+                self._num_found += change
+
+    def write_cells(self, changes):
+        """Writes a batch of changed cells into the game in place.
+
+        Parameters:
+            changes (list<tuple<int, str>>): Index and new character of each changed cell.
+        """
+        if not changes:
+            return
+        self._touched.update(index for index, _ in changes)
+        game = self._game
+        for index, character in changes:
+            self.count_cell(index, game[index], -1)
+            self.count_cell(index, character, 1)
+            game[index] = character
+        self.notify(changes)
+
+    def notify(self, changes):
+        """Passes a batch of changed cells to on_change, so a view can draw only those cells.
+
+        Parameters:
+            changes (list<tuple<int, str>>): Index and new character of each changed cell.
+        """
+        if self._on_change is not None and changes:
+            self._on_change(changes)
     
     def get_game(self):
         """Returns the current representation of the game string.
@@ -64,13 +401,21 @@ class BoardModel(object):
         Returns:
         (str): The string representation of the game.
         """
-        return self._game
+        return str(self._game)
+
+    def get_grid_size(self):
+        """Returns the grid size of the game.
+
+        Returns:
+        (int): The grid size of the game.
+        """
+        return self._grid_size
 
     def get_pokemon_locations(self):
         """Returns the index or indices of where pokemon are located relative to the game string.
         
         Returns:
-        (tuple<int>): index or indicies of pokemon locations.
+        (frozenset<int>): index or indicies of pokemon locations.
         """
         return self._pokemon_locations
     
@@ -90,7 +435,7 @@ class BoardModel(object):
         Returns:
         (int): Number of pokeballs placed.
         """
-        count =  self._game.count(FLAG)
+        count =  self._num_flags
         if count <= self._num_pokeballs:
             return count
         else:
@@ -102,162 +447,1379 @@ class BoardModel(object):
         Returns:
         (int): Number of hidden pokemon loaded in the game.
         """
-        return self._num_pokemon
+        return self._num_pokemon
+
+    def position_to_index(self, position):
+        """Convert the row, column coordinate in the game board to the game strings index.
+        
+        Returns:
+        (int): The index of the cell in the game string.
+        """
+        x, y = position
+        return x * self._grid_size + y
+
+    def replace_character_at_index(self, index, character):
+        """A specified index in the game string at the specified index is replaced by
+        a new character.
+        
+        Returns:
+        (str): The updated game string.
+        """
+        self.write_cells([(index, character)])
+
+    def neighbour_directions(self, index, grid_size):
+        """Seek out all direction that has a neighbouring cell.
+
+        Parameters:
+            index (int): The index in the game string.
+            grid_size (int): The grid size of the game.
+
+        Returns:
+            (list<int>): A list of index that has a neighbouring cell.
+        """
+        return list(neighbour_table(grid_size)[index])
+
+    def index_in_direction(self, index, direction):
+        """The index in the game string is updated by determining the
+        adjacent cell given the direction.
+        The index of the adjacent cell in the game is then calculated and returned.
+
+        Parameters:
+            index (int): The index in the game string.
+            direction (str): The direction of the adjacent cell.
+
+        Returns:
+            (int): The index in the game string corresponding to the new cell position
+            in the game.
+
+            None for invalid direction.
+        """
+        # convert index to row, col coordinate
+        row, col = divmod(index, self._grid_size)
+        row_offset, col_offset = DIRECTION_OFFSETS.get(direction, (0, 0))
+        row += row_offset
+        col += col_offset
+        if not (0 <= col < self._grid_size and 0 <= row < self._grid_size):
+            return None
+        return self.position_to_index((row, col))
+
+    def number_at_cell(self, index):
+        """Calculates what number should be displayed at that specific index in the game.
+
+        Parameters:
+            index (int): Index of the currently selected cell
+
+        Returns:
+            (int): Number to be displayed at the given index in the game string.
+        """
+        return self._counts[index]
+
+    def get_counts(self):
+        """Returns the number of adjacent pokemon of every cell.
+
+        Returns:
+            (bytes): The count of each index in the game string.
+        """
+        return bytes(self._counts)
+
+    def zero_region(self, index):
+        """Looks up the cells opened by a click on a cell with no adjacent pokemon.
+
+        A region is labelled the first time one of its cells is opened, and kept
+        until the pokemon move, so the cells come from a stored range after that.
+
+        Parameters:
+            index (int): Index of a cell with no adjacent pokemon.
+
+        Returns:
+            (array<int>): The cells of the region and its border, or None if a flag
+            is among them, as the flag would cut the region short.
+        """
+        if self._zero_regions is None:
+            self._zero_regions = (array("i", [-1]) * self._grid_size ** 2, array("i", [0]),
+                                  array("i"))
+        labels, starts, cells = self._zero_regions
+        region = labels[index]
+        if region == -1:
+            region = self.label_zero_region(index)
+        reveal = cells[starts[region]:starts[region + 1]]
+        if self._num_flags and any(self._game[cell] == FLAG for cell in reveal):
+            return None
+        return reveal
+
+    def label_zero_region(self, index):
+        """Labels the zero region around a cell, ignoring flags, and stores the cells a
+        click in it opens after the other regions' cells.
+
+        Parameters:
+            index (int): Index of a cell with no adjacent pokemon.
+
+        Returns:
+            (int): The label of the region.
+        """
+        labels, starts, cells = self._zero_regions
+        region = len(starts) - 1
+        counts = self._counts
+        neighbours = neighbour_table(self._grid_size)
+        discovered = new_bitmap(self._grid_size)
+        discovered[index] = 1
+        labels[index] = region
+        cells.append(index)
+        queue = [index]
+        while queue:
+            node = queue.pop()
+            for neighbour in neighbours[node]:
+                if discovered[neighbour]:
+                    continue
+                discovered[neighbour] = 1
+                cells.append(neighbour)
+                if counts[neighbour] == 0:
+                    labels[neighbour] = region
+                    queue.append(neighbour)
+        starts.append(len(cells))
+        return region
+
+    def big_fun_search(self, index):
+        """Searching adjacent cells to see if there are any Pokemon present.
+        
+        Parameters:
+            index (int): Index of the currently selected cell.
+
+        Returns:
+            (list<int>): List of cells to turn visible.
+        """
+        if self._game[index] != FLAG and self.number_at_cell(index) == 0:
+            reveal = self.zero_region(index)
+            if reveal is not None:
+                return [cell for cell in reveal if cell != index]
+
+        queue = [index]
+        #Marks the cells already searched, one byte per cell
+        discovered = new_bitmap(self._grid_size)
+        discovered[index] = 1
+        visible = []
+            
+        if self._game[index] == FLAG:
+            return queue
+
+        number = self.number_at_cell(index)
+        if number != 0:
+            return queue
+
+        neighbours = neighbour_table(self._grid_size)
+        while queue:
+            node = queue.pop()
+            for neighbour in neighbours[node]:
+                if discovered[neighbour]:
+                    continue
+
+                discovered[neighbour] = 1
+                if self._game[neighbour] != FLAG:
+                    number = self.number_at_cell(neighbour)
+                    if number == 0:
+                        queue.append(neighbour)
+                visible.append(neighbour)
+        return visible
+
+    def flood_reveal(self, index):
+        """Finds the cells exposed by selecting a cell, along with their numbers, in one pass.
+
+        The search is the same as big_fun_search, but the selected cell is included
+        and only unexposed cells are returned. A region with no flags in it is taken
+        from zero_region without a search.
+
+        Parameters:
+            index (int): Index of the currently selected cell.
+
+        Returns:
+            (list<tuple<int, int>>): Index and number of each cell to expose.
+        """
+        game = self._game
+        if game[index] == FLAG:
+            return []
+        counts = self._counts
+        if counts[index] == 0:
+            reveal = self.zero_region(index)
+            if reveal is not None:
+                return [(cell, counts[cell]) for cell in reveal if game[cell] == UNEXPOSED]
+        revealed = [(index, counts[index])] if game[index] == UNEXPOSED else []
+        if counts[index] != 0:
+            return revealed
+
+        neighbours = neighbour_table(self._grid_size)
+        discovered = new_bitmap(self._grid_size)
+        discovered[index] = 1
+        queue = [index]
+        while queue:
+            node = queue.pop()
+            for neighbour in neighbours[node]:
+                if discovered[neighbour]:
+                    continue
+                discovered[neighbour] = 1
+                if game[neighbour] == FLAG:
+                    continue
+                if counts[neighbour] == 0:
+                    queue.append(neighbour)
+                if game[neighbour] == UNEXPOSED:
+                    revealed.append((neighbour, counts[neighbour]))
+        return revealed
+
+    def expose_cells(self, revealed):
+        """Writes the numbers of a whole revealed region into the game string in one update.
+
+        Parameters:
+            revealed (list<tuple<int, int>>): Index and number of each cell to expose.
+        """
+        self.write_cells([(index, str(number)) for index, number in revealed])
+
+    def flag_cell(self, index):
+        """Toggle Flag on or off at selected index. If the selected index is already
+        revealed, the game would return with no changes.
+        
+        Returns:
+        (str): The updated game string.
+        """
+        if self._game[index] == FLAG:
+            self.replace_character_at_index(index, UNEXPOSED)
+
+        elif self._game[index] == UNEXPOSED:
+            self.replace_character_at_index(index, FLAG)
+
+    def check_win(self):
+        """Checks if the player has won the game.
+        
+        Returns:
+        (bool): True if the player has won the game, false if not.
+        """
+        return (self._num_unexposed == 0 and self._num_flags == self._num_found
+                and self._num_found == len(self._pokemon_locations))
+    
+    def check_loss(self, index):
+        """Checks if the player has lost the game and updates the game string accordingly.
+        
+        Returns:
+        (bool): True if the player has lost the game, false if not.        
+        """
+        if index in self._pokemon_locations:
+            self.write_cells([(i, POKEMON) for i in self._pokemon_locations])
+            return True            
+        
+    def reveal_cells(self, index):
+        """Reveals all neighbouring cells at index and repeats for all
+        cells that had a 0.
+
+        Does not reveal flagged cells or cells with Pokemon.
+
+        Parameters:
+            index (int): Index of the currently selected cell
+
+        Returns:
+            (str): The updated game string
+        """
+        self.expose_cells(self.flood_reveal(index))
+        return self.get_game()
+    
+    def exposed_cells(self):
+        """Finds the exposed cells in the game string.
+
+        Returns:
+            (list<int>): Index of each exposed cell.
+        """
+        return [index for index, character in enumerate(self._game) if character.isdigit()]
+
+    def flagged_cells(self):
+        """Finds the flagged cells in the game string.
+
+        Returns:
+            (list<int>): Index of each flagged cell.
+        """
+        game = str(self._game)
+        cells = []
+        index = game.find(FLAG)
+        while index != -1:
+            cells.append(index)
+            index = game.find(FLAG, index + 1)
+        return cells
+
+    def update_constraints(self):
+        """Brings the frontier constraints up to date with the cells written since the last update.
+
+        Each exposed number next to unexposed or flagged cells constrains how many of them
+        hold pokemon. Only the written cells and their neighbours are looked at again.
+        """
+        game = self._game
+        neighbours = neighbour_table(self._grid_size)
+        if self._constraints is None:
+            self._constraints = {}
+            cells = self.exposed_cells()
+        else:
+            cells = set(self._touched)
+            for index in self._touched:
+                cells.update(neighbours[index])
+        self._touched = set()
+
+        for index in cells:
+            character = game[index]
+            unknown = ()
+            if character.isdigit():
+                unknown = tuple(neighbour for neighbour in neighbours[index]
+                                if not game[neighbour].isdigit())
+            if unknown:
+                self._constraints[index] = (unknown, int(character))
+            else:
+                self._constraints.pop(index, None)
+
+    def constraint_components(self):
+        """Splits the frontier constraints into components which share no cells.
+
+        Returns:
+            (list<tuple<tuple<tuple<int>, int>>>): The constraints of each component.
+        """
+        constraints = self._constraints
+        by_cell = {}
+        for index, (cells, _) in constraints.items():
+            for cell in cells:
+                by_cell.setdefault(cell, []).append(index)
+        components = []
+        seen = set()
+        for start in constraints:
+            if start in seen:
+                continue
+            seen.add(start)
+            queue = [start]
+            component = []
+            while queue:
+                index = queue.pop()
+                component.append(constraints[index])
+                for cell in constraints[index][0]:
+                    for other in by_cell[cell]:
+                        if other not in seen:
+                            seen.add(other)
+                            queue.append(other)
+            components.append(tuple(component))
+        return components
+
+    def pokemon_probabilities(self):
+        """Works out the exact chance of each unexposed cell holding a pokemon.
+
+        Flags are treated as unexposed cells, as they may be wrong. Every frontier
+        component is counted separately and the results are combined with the total
+        number of pokemon. Components are cached by their constraints, so after a move
+        only the components it changed are counted again.
+
+        Returns:
+            (tuple<dict<int, float>, float>): The chance for each cell next to an exposed
+            number, and the chance for any other unexposed cell.
+        """
+        if self._probabilities is not None and not self._touched:
+            return self._probabilities
+        self.update_constraints()
+
+        cache = {}
+        components = []
+        for component in self.constraint_components():
+            key = frozenset(component)
+            layouts = self._component_cache.get(key)
+            if layouts is None:
+                layouts = enumerate_component(component)
+            cache[key] = layouts
+            components.append(layouts)
+        #Only the components still on the board are kept
+        self._component_cache = cache
+
+        frontier_size = sum(len(cells) for groups, _ in components for cells in groups)
+        other_cells = self._num_unexposed + self._num_flags - frontier_size
+        total = len(self._pokemon_locations)
+
+        def rest(count):
+            #Ways of placing the pokemon left over in the cells away from the frontier
+            left = total - count
+            return comb(other_cells, left) if 0 <= left <= other_cells else 0
+
+        distributions = [{count: ways for count, (ways, _) in layouts.items()}
+                         for _, layouts in components]
+        prefixes = [{0: 1}]
+        for distribution in distributions:
+            prefixes.append(convolve(prefixes[-1], distribution))
+        suffixes = [{0: 1}]
+        for distribution in reversed(distributions):
+            suffixes.append(convolve(suffixes[-1], distribution))
+        suffixes.reverse()
+
+        every_layout = sum(ways * rest(count) for count, ways in prefixes[-1].items())
+        if every_layout == 0:
+            self._probabilities = ({}, 0.0)
+            return self._probabilities
+        other = 0.0
+        if other_cells:
+            other = sum(ways * rest(count) * (total - count)
+                        for count, ways in prefixes[-1].items()) / (every_layout * other_cells)
+
+        probabilities = {}
+        for position, (groups, layouts) in enumerate(components):
+            others = convolve(prefixes[position], suffixes[position + 1])
+            shares = [0] * len(groups)
+            for count, (_, group_pokemon) in layouts.items():
+                weight = sum(ways * rest(count + other_count) for other_count, ways in others.items())
+                if weight:
+                    for group, pokemon in enumerate(group_pokemon):
+                        shares[group] += pokemon * weight
+            for group, cells in enumerate(groups):
+                chance = shares[group] / (every_layout * len(cells))
+                for cell in cells:
+                    probabilities[cell] = chance
+        self._probabilities = (probabilities, other)
+        return self._probabilities
+
+    def pokemon_probability(self, index):
+        """Works out the chance of a cell holding a pokemon, as a hint for the player.
+
+        Parameters:
+            index (int): Index of the cell.
+
+        Returns:
+            (float): The chance of a pokemon at the cell. 0 for an exposed cell.
+        """
+        if self._game[index].isdigit():
+            return 0.0
+        probabilities, other = self.pokemon_probabilities()
+        return probabilities.get(index, other)
+
+    def reset(self, new):
+        """Resets the game string to its original form.
+        
+        Returns:
+        (str): The original game string.
+        """
+        self._game = DenseGame(new)
+        self.recount()
+
+    def ball_reset(self, ball):
+        """Resets the number of pokeballs to be placed.
+        
+        Returns:
+        (int): Number of pokeballs to be placed.
+        """
+        self._num_pokeballs = ball
+
+    def loc_reset(self, pokemon):
+        """Resets the index or indices of where pokemon are located relative to the game string.
+        
+        Returns:
+        (frozenset<int>): index or indicies of pokemon locations.
+        """
+        self.set_pokemon_locations(eval(pokemon))
+    
+
+
+class DenseGame(list):
+    """The game string of a grid, kept as a list of characters so cells are changed in
+    place. The string is only joined again when it is asked for after a change.
+    """
+    def __init__(self, game):
+        """Initializes the DenseGame.
+
+        Parameters:
+        game(str): The game string.
+        """
+        super().__init__(game)
+        self._string = game
+
+    def __setitem__(self, index, character):
+        super().__setitem__(index, character)
+        self._string = None
+
+    def __str__(self):
+        if self._string is None:
+            self._string = "".join(self)
+        return self._string
+
+
+class SparseGame(object):
+    """The game string of a very large grid, which only stores the exposed and flagged cells.
+    """
+    def __init__(self, grid_size):
+        """Initializes the SparseGame with every cell unexposed.
+
+        Parameters:
+        grid_size(int): The grid size of the game.
+        """
+        self._grid_size = grid_size
+        self._cells = {}
+
+    def __getitem__(self, index):
+        return self._cells.get(index, UNEXPOSED)
+
+    def __setitem__(self, index, character):
+        if character == UNEXPOSED:
+            self._cells.pop(index, None)
+        else:
+            self._cells[index] = character
+
+    def __len__(self):
+        return self._grid_size ** 2
+
+    def __str__(self):
+        return "".join(self[index] for index in range(len(self)))
+
+    def count(self, character):
+        """Counts the cells holding a character.
+
+        Parameters:
+            character (str): The character to count.
+
+        Returns:
+            (int): Number of cells holding the character.
+        """
+        if character == UNEXPOSED:
+            return len(self) - len(self._cells)
+        return sum(1 for stored in self._cells.values() if stored == character)
+
+    def stored_cells(self):
+        """Returns the exposed and flagged cells.
+
+        Returns:
+        (dict<int, str>): The character of each stored index.
+        """
+        return self._cells
+
+
+class SparseBoardModel(BoardModel):
+    """A BoardModel for very large grids, such as 10,000 x 10,000.
+
+    Only the exposed and flagged cells are stored, and the number at a cell is only
+    counted when it is first needed, so memory grows with the cells played rather than
+    the size of the grid.
+    """
+    def empty_game(self):
+        """Creates a sparse game with no cells exposed.
+
+        Returns:
+            (SparseGame): The unexposed game.
+        """
+        return SparseGame(self._grid_size)
+
+    def get_game(self):
+        """Returns the sparse game, as the full game string is too big to build.
+
+        Returns:
+        (SparseGame): The game, indexed like the game string.
+        """
+        return self._game
+
+    def set_pokemon_locations(self, pokemon_locations):
+        """Stores the pokemon locations, leaving the adjacent pokemon to be counted lazily.
+
+        Parameters:
+            pokemon_locations (iterable<int>): Index or indices of pokemon locations.
+        """
+        self._pokemon_locations = frozenset(pokemon_locations)
+        self._counts = LazyCounts(self._grid_size, self._pokemon_locations)
+        self.recount()
+
+    def zero_region(self, index):
+        """Leaves zero regions to be searched, as labelling them would visit the whole grid.
+
+        Parameters:
+            index (int): Index of a cell with no adjacent pokemon.
+
+        Returns:
+            (None): No precomputed region.
+        """
+        return None
+
+    def write_cells(self, changes):
+        """Writes a batch of changed cells into the sparse game.
+
+        Parameters:
+            changes (list<tuple<int, str>>): Index and new character of each changed cell.
+        """
+        self._touched.update(index for index, _ in changes)
+        for index, character in changes:
+            self.count_cell(index, self._game[index], -1)
+            self.count_cell(index, character, 1)
+            self._game[index] = character
+        self.notify(changes)
+
+    def exposed_cells(self):
+        """Finds the exposed cells from the stored cells, without visiting the whole grid.
+
+        Returns:
+            (list<int>): Index of each exposed cell.
+        """
+        return [index for index, character in self._game.stored_cells().items()
+                if character.isdigit()]
+
+    def flagged_cells(self):
+        """Finds the flagged cells from the stored cells, without visiting the whole grid.
+
+        Returns:
+            (list<int>): Index of each flagged cell.
+        """
+        return [index for index, character in self._game.stored_cells().items()
+                if character == FLAG]
+
+    def get_counts(self):
+        """Counts the adjacent pokemon of every cell, as the lazy counts only keep the
+        cells looked up.
+
+        Returns:
+            (bytes): The count of each index in the game string.
+        """
+        return bytes(adjacency_counts(self._grid_size, self._pokemon_locations))
+
+
+#Characters of the cells in a byte per cell form of a bitboard game
+EXPOSED_CODES = 9
+UNEXPOSED_CODE, FLAG_CODE, POKEMON_CODE = range(EXPOSED_CODES, EXPOSED_CODES + 3)
+GAME_CHARACTERS = {**{number: str(number) for number in range(EXPOSED_CODES)},
+                   UNEXPOSED_CODE: UNEXPOSED, FLAG_CODE: FLAG, POKEMON_CODE: POKEMON}
+
+
+def bits_to_string(mask, size):
+    """Writes a bitmask out as a string of '0' and '1', with cell 0 first.
+
+    Parameters:
+        mask (int): The bitmask, with a bit for each cell.
+        size (int): The number of cells.
+
+    Returns:
+        (str): '1' for each marked cell and '0' for each other cell.
+    """
+    return format(mask, f"0{size}b")[::-1] if size else ""
+
+
+def bit_indices(mask, size):
+    """Finds the marked cells of a bitmask.
+
+    Parameters:
+        mask (int): The bitmask, with a bit for each cell.
+        size (int): The number of cells.
+
+    Returns:
+        (list<int>): Index of each marked cell, in order.
+    """
+    bits = bits_to_string(mask, size)
+    indices = []
+    index = bits.find("1")
+    while index != -1:
+        indices.append(index)
+        index = bits.find("1", index + 1)
+    return indices
+
+
+def indices_to_bits(indices, size):
+    """Builds the bitmask marking a set of cells.
+
+    Parameters:
+        indices (iterable<int>): Index of each cell to mark.
+        size (int): The number of cells.
+
+    Returns:
+        (int): The bitmask, with bit i set for each marked index i.
+    """
+    bits = bytearray(b"0" * size)
+    for index in indices:
+        bits[index] = ord("1")
+    return int(bits[::-1], 2) if size else 0
+
+
+#Turns the '0' and '1' of bits_to_string into the bytes 0 and 1
+BIT_BYTES = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def byte_lanes(mask, size):
+    """Spreads a bitmask out to one byte per cell, so each cell can hold a small number.
+
+    Parameters:
+        mask (int): The bitmask, with a bit for each cell.
+        size (int): The number of cells.
+
+    Returns:
+        (int): An int holding 1 in the byte of each marked cell and 0 in every other byte.
+    """
+    return int.from_bytes(bits_to_string(mask, size).encode().translate(BIT_BYTES), "little")
+
+
+class BitBoardModel(BoardModel):
+    """A BoardModel which keeps the pokemon, exposed and flagged cells as int bitmasks.
+
+    Bit i of each mask is the cell at index i. Counting, flooding and win checks are
+    done with shifts and ANDs over the whole board, and the game string is only built
+    when it is asked for.
+    """
+    @property
+    def _game(self):
+        """The game string, built from the bitmasks the first time it is read after a change.
+        """
+        if self._game_string is None:
+            size = self._grid_size ** 2
+            unexposed = self._full & ~(self._exposed | self._flags | self._shown)
+            lanes = (self._count_lanes & byte_lanes(self._exposed, size) * 0xFF
+                     | byte_lanes(unexposed, size) * UNEXPOSED_CODE
+                     | byte_lanes(self._flags, size) * FLAG_CODE
+                     | byte_lanes(self._shown, size) * POKEMON_CODE)
+            self._game_string = lanes.to_bytes(size, "little").decode("latin-1").translate(
+                GAME_CHARACTERS)
+        return self._game_string
+
+    @_game.setter
+    def _game(self, game):
+        """Reads the exposed, flagged and shown pokemon cells from a game string.
+        """
+        game = str(game).rstrip("\n")
+        self._exposed = self.read_layer(game, "0123456789")
+        self._flags = self.read_layer(game, FLAG)
+        self._shown = self.read_layer(game, POKEMON)
+        self._touched_bits = 0
+        self._game_string = None
+
+    def read_layer(self, game, characters):
+        """Marks the cells of a game string holding any of the given characters.
+
+        Parameters:
+            game (str): The game string.
+            characters (str): The characters to mark.
+
+        Returns:
+            (int): The bitmask of the marked cells.
+        """
+        bits = game.translate({ord(character): "1" if character in characters else "0"
+                               for character in set(game)})
+        return int(bits[::-1], 2) if bits else 0
+
+    def set_pokemon_locations(self, pokemon_locations):
+        """Stores the pokemon as a bitmask and counts the pokemon next to every cell.
+
+        The eight shifted pokemon masks are added with a bitwise adder into four bit
+        planes of the count, which are then spread out to a byte per cell.
+
+        Parameters:
+            pokemon_locations (iterable<int>): Index or indices of pokemon locations.
+        """
+        grid_size = self._grid_size
+        size = grid_size ** 2
+        self._pokemon_locations = frozenset(pokemon_locations)
+        self._full = (1 << size) - 1
+        first_column = int(("0" * (grid_size - 1) + "1") * grid_size, 2) if grid_size else 0
+        #Cells which can move right, or left, without wrapping onto another row
+        self._not_last_column = self._full & ~(first_column << (grid_size - 1))
+        self._not_first_column = self._full & ~first_column
+        self._pokemon = indices_to_bits(self._pokemon_locations, size)
+
+        planes = [0, 0, 0, 0]
+        for neighbours in self.shifted_layers(self._pokemon):
+            carry = neighbours
+            for plane, bits in enumerate(planes):
+                planes[plane] = bits ^ carry
+                carry &= bits
+        self._zero = self._full & ~(planes[0] | planes[1] | planes[2] | planes[3])
+        self._count_lanes = sum(byte_lanes(bits, size) << plane
+                                for plane, bits in enumerate(planes))
+        self._counts = self._count_lanes.to_bytes(size, "little")
+        self._zero_regions = None
+        self.recount()
+
+    def shifted_layers(self, mask):
+        """Moves a mask one cell in each direction, dropping the cells moved off the grid.
+
+        Parameters:
+            mask (int): The bitmask to move.
+
+        Returns:
+            (list<int>): The mask moved in each of the eight directions.
+        """
+        grid_size = self._grid_size
+        left = (mask & self._not_first_column) >> 1
+        right = (mask & self._not_last_column) << 1
+        layers = []
+        for row in (mask, left, right):
+            layers.append(row >> grid_size)
+            layers.append((row << grid_size) & self._full)
+        return layers + [left, right]
+
+    def dilate(self, mask):
+        """Marks every cell next to or on a marked cell.
+
+        Parameters:
+            mask (int): The bitmask to grow.
+
+        Returns:
+            (int): The grown bitmask.
+        """
+        row = mask | (mask & self._not_first_column) >> 1 | (mask & self._not_last_column) << 1
+        return (row | row >> self._grid_size | row << self._grid_size) & self._full
+
+    def recount(self):
+        """Counts the unexposed cells, flags and flags placed on pokemon from the bitmasks.
+        """
+        covered = self._exposed | self._flags | self._shown
+        self._num_unexposed = (self._full & ~covered).bit_count()
+        self._num_flags = self._flags.bit_count()
+        self._num_found = (self._flags & self._pokemon).bit_count()
+        self._game_string = None
+        #The frontier constraints are rebuilt the next time probabilities are asked for
+        self._constraints = None
+        self._touched = set()
+        self._touched_bits = 0
+        self._probabilities = None
+
+    def write_cells(self, changes):
+        """Writes a batch of changed cells into the bitmasks and counts them again.
+
+        Parameters:
+            changes (list<tuple<int, str>>): Index and new character of each changed cell.
+        """
+        if not changes:
+            return
+        changed = exposed = flags = shown = 0
+        for index, character in changes:
+            bit = 1 << index
+            changed |= bit
+            if character.isdigit():
+                exposed |= bit
+            elif character == FLAG:
+                flags |= bit
+            elif character == POKEMON:
+                shown |= bit
+        self._exposed = self._exposed & ~changed | exposed
+        self._flags = self._flags & ~changed | flags
+        self._shown = self._shown & ~changed | shown
+        self.recount()
+        self.notify(changes)
+
+    def expose_mask(self, mask):
+        """Exposes the cells of a bitmask, keeping the counts up to date.
+
+        Parameters:
+            mask (int): The bitmask of the unexposed cells to expose.
+        """
+        self._exposed |= mask
+        self._num_unexposed -= mask.bit_count()
+        self._touched_bits |= mask
+        self._game_string = None
+        if self._on_change is not None:
+            counts = self._counts
+            self.notify([(index, str(counts[index]))
+                         for index in bit_indices(mask, self._grid_size ** 2)])
+
+    def flood_mask(self, index):
+        """Finds the cells exposed by selecting a cell, as a bitmask.
+
+        The zero region around the cell is grown by a masked dilation until it stops
+        growing, then grown once more to take in the numbers on its border.
+
+        Parameters:
+            index (int): Index of the currently selected cell.
+
+        Returns:
+            (int): The bitmask of the unexposed cells to expose.
+        """
+        bit = 1 << index
+        if self._flags & bit:
+            return 0
+        unexposed = self._full & ~(self._exposed | self._flags | self._shown)
+        if not self._zero & bit:
+            return bit & unexposed
+        open_cells = self._zero & ~self._flags
+        region = bit
+        while True:
+            grown = self.dilate(region) & open_cells | region
+            if grown == region:
+                break
+            region = grown
+        return (self.dilate(region) | bit) & unexposed
+
+    def flood_reveal(self, index):
+        """Finds the cells exposed by selecting a cell, along with their numbers.
+
+        Parameters:
+            index (int): Index of the currently selected cell.
+
+        Returns:
+            (list<tuple<int, int>>): Index and number of each cell to expose.
+        """
+        counts = self._counts
+        return [(cell, counts[cell])
+                for cell in bit_indices(self.flood_mask(index), self._grid_size ** 2)]
+
+    def expose_cells(self, revealed):
+        """Exposes a whole revealed region in one update.
+
+        Parameters:
+            revealed (list<tuple<int, int>>): Index and number of each cell to expose.
+        """
+        self.expose_mask(indices_to_bits((index for index, _ in revealed), self._grid_size ** 2))
+
+    def reveal_cells(self, index):
+        """Reveals the cell at index, flooding out from cells with a 0, without
+        building the list of revealed cells.
+
+        Parameters:
+            index (int): Index of the currently selected cell
+
+        Returns:
+            (str): The updated game string
+        """
+        self.expose_mask(self.flood_mask(index))
+        return self._game
+
+    def flag_cell(self, index):
+        """Toggle Flag on or off at selected index. Exposed cells are left alone.
+
+        Parameters:
+            index (int): Index of the selected cell.
+        """
+        bit = 1 << index
+        if self._flags & bit:
+            change = -1
+        elif (self._exposed | self._shown) & bit:
+            return
+        else:
+            change = 1
+        self._flags ^= bit
+        self._num_unexposed -= change
+        self._num_flags += change
+        if self._pokemon & bit:
+            self._num_found += change
+        self._touched_bits |= bit
+        self._game_string = None
+        self.notify([(index, FLAG if change == 1 else UNEXPOSED)])
+
+    def check_win(self):
+        """Checks if every cell is exposed or flagged and the flags are on the pokemon.
+
+        Returns:
+        (bool): True if the player has won the game, false if not.
+        """
+        return ((self._exposed | self._flags) == self._full and self._flags == self._pokemon
+                and not self._shown)
+
+    def check_loss(self, index):
+        """Checks if the player has lost the game, showing every pokemon if so.
+
+        Returns:
+        (bool): True if the player has lost the game, false if not.
+        """
+        if self._pokemon >> index & 1:
+            self._exposed &= ~self._pokemon
+            self._flags &= ~self._pokemon
+            self._shown = self._pokemon
+            self.recount()
+            self.notify([(index, POKEMON) for index in self._pokemon_locations])
+            return True
+
+    def exposed_cells(self):
+        """Finds the exposed cells from the exposed bitmask.
+
+        Returns:
+            (list<int>): Index of each exposed cell.
+        """
+        return bit_indices(self._exposed, self._grid_size ** 2)
+
+    def flagged_cells(self):
+        """Finds the flagged cells from the flag bitmask.
+
+        Returns:
+            (list<int>): Index of each flagged cell.
+        """
+        return bit_indices(self._flags, self._grid_size ** 2)
+
+    def pokemon_probabilities(self):
+        """Works out the exact chance of each unexposed cell holding a pokemon.
+
+        The cells changed since the last call are handed over from a bitmask first,
+        so the frontier constraints are updated as in BoardModel.
+
+        Returns:
+            (tuple<dict<int, float>, float>): The chance for each cell next to an exposed
+            number, and the chance for any other unexposed cell.
+        """
+        if self._touched_bits:
+            self._touched.update(bit_indices(self._touched_bits, self._grid_size ** 2))
+            self._touched_bits = 0
+        return super().pokemon_probabilities()
+
+
+
+#Magic number, grid size, pokemon, pokeballs, unexposed cells, flags and flags on pokemon
+MAPPED_HEADER = struct.Struct("<4s6Q")
+MAPPED_MAGIC = b"PKMB"
+#Bytes looked at in one go when scanning a layer, skipping blocks with nothing set
+SCAN_BLOCK = 4096
+#States of a cell, two bits per cell of a mapped game
+MAPPED_STATES = (UNEXPOSED, FLAG, None, POKEMON)
+FLAG_STATE = 1
+EXPOSED_STATE = 2
+
+
+def set_indices(layer, bits_per_cell):
+    """Finds the cells with a non-zero value in a packed layer, skipping empty blocks.
+
+    Parameters:
+        layer (memoryview): The layer, with the cells of each byte from the low bits up.
+        bits_per_cell (int): The number of bits each cell takes.
+
+    Returns:
+        (generator<int>): Index of each cell with a non-zero value, in order.
+    """
+    cells_per_byte = 8 // bits_per_cell
+    mask = (1 << bits_per_cell) - 1
+    empty = bytes(SCAN_BLOCK)
+    for start in range(0, len(layer), SCAN_BLOCK):
+        block = layer[start:start + SCAN_BLOCK]
+        if block == empty[:len(block)]:
+            continue
+        for offset, byte in enumerate(block):
+            if not byte:
+                continue
+            first = (start + offset) * cells_per_byte
+            for cell in range(cells_per_byte):
+                if byte >> (cell * bits_per_cell) & mask:
+                    yield first + cell
+
+
+class PokemonLayer(object):
+    """The pokemon of a mapped game, one bit per cell, used in place of a frozenset.
+    """
+    def __init__(self, layer, num_pokemon):
+        """Initializes the PokemonLayer.
+
+        Parameters:
+        layer(memoryview): The mapped pokemon bits.
+        num_pokemon(int): The number of pokemon set in the layer.
+        """
+        self._layer = layer
+        self._num_pokemon = num_pokemon
+
+    def __contains__(self, index):
+        return bool(self._layer[index >> 3] >> (index & 7) & 1)
+
+    def __len__(self):
+        return self._num_pokemon
+
+    def __iter__(self):
+        return set_indices(self._layer, 1)
+
+    def add(self, index):
+        """Places a pokemon at a cell.
+
+        Parameters:
+            index (int): Index of the cell.
+
+        Returns:
+            (bool): False if there was a pokemon at the cell already.
+        """
+        if index in self:
+            return False
+        self._layer[index >> 3] |= 1 << (index & 7)
+        self._num_pokemon += 1
+        return True
+
+    def clear(self):
+        """Removes every pokemon.
+        """
+        self._layer[:] = bytes(len(self._layer))
+        self._num_pokemon = 0
+
+
+class MappedCounts(LazyCounts):
+    """Adjacent pokemon counts read from the pokemon layer each time, so nothing is kept
+    for the cells looked at.
+    """
+    def __getitem__(self, index):
+        return sum(1 for neighbour in self._neighbours[index]
+                   if neighbour in self._pokemon_locations)
+
+
+class MappedGame(object):
+    """The game of a board kept in a memory-mapped file, used in place of the game string.
+
+    The file holds a header with the counts, two bits of state per cell and one
+    pokemon bit per cell. Cells are read and written through memoryview slices of the
+    mapping, so only the pages of the cells used are touched.
+    """
+    def __init__(self, filename, grid_size = None):
+        """Opens the game in a file, or creates an unexposed game when a grid size is given.
+
+        Parameters:
+        filename(str): The file of the game.
+        grid_size(int): The grid size of a new game.
+        """
+        if grid_size is not None:
+            cells = grid_size ** 2
+            with open(filename, "wb") as file:
+                file.write(MAPPED_HEADER.pack(MAPPED_MAGIC, grid_size, 0, 0, cells, 0, 0))
+                file.truncate(MAPPED_HEADER.size + (cells + 3) // 4 + (cells + 7) // 8)
+        self._file = open(filename, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        view = memoryview(self._map)
+        self._header = view[:MAPPED_HEADER.size]
+        self._views = [view, self._header]
+        magic, self._grid_size = MAPPED_HEADER.unpack(self._header)[:2]
+        if magic != MAPPED_MAGIC:
+            self.close()
+            raise ValueError(f"{filename} is not a mapped game")
+        cells = self._grid_size ** 2
+        state_end = MAPPED_HEADER.size + (cells + 3) // 4
+        self._states = view[MAPPED_HEADER.size:state_end]
+        pokemon = view[state_end:state_end + (cells + 7) // 8]
+        self._views += [self._states, pokemon]
+        self.pokemon = PokemonLayer(pokemon, self.read_header()[1])
+        self.counts = MappedCounts(self._grid_size, self.pokemon)
+
+    def __getitem__(self, index):
+        state = self.state(index)
+        if state == EXPOSED_STATE:
+            return str(self.counts[index])
+        return MAPPED_STATES[state]
+
+    def __setitem__(self, index, character):
+        state = EXPOSED_STATE if character.isdigit() else MAPPED_STATES.index(character)
+        shift = (index & 3) * 2
+        byte = self._states[index >> 2]
+        self._states[index >> 2] = byte & ~(3 << shift) | state << shift
+
+    def __len__(self):
+        return self._grid_size ** 2
+
+    def __str__(self):
+        return "".join(self[index] for index in range(len(self)))
+
+    def state(self, index):
+        """Reads the two state bits of a cell.
+
+        Parameters:
+            index (int): Index of the cell.
+
+        Returns:
+            (int): The position of the cell's state in MAPPED_STATES.
+        """
+        return self._states[index >> 2] >> ((index & 3) * 2) & 3
+
+    def exposed_cells(self):
+        """Finds the exposed cells, skipping blocks where every cell is unexposed.
+
+        Returns:
+            (list<int>): Index of each exposed cell.
+        """
+        return [index for index in set_indices(self._states, 2)
+                if self.state(index) == EXPOSED_STATE]
+
+    def flagged_cells(self):
+        """Finds the flagged cells, skipping blocks where every cell is unexposed.
 
-    def position_to_index(self, position):
-        """Convert the row, column coordinate in the game board to the game strings index.
-        
         Returns:
-        (int): The index of the cell in the game string.
+            (list<int>): Index of each flagged cell.
         """
-        x, y = position
-        return x * self._grid_size + y
+        return [index for index in set_indices(self._states, 2)
+                if self.state(index) == FLAG_STATE]
+
+    def read_header(self):
+        """Reads the grid size, pokemon, pokeballs and running counts from the header.
 
-    def replace_character_at_index(self, index, character):
-        """A specified index in the game string at the specified index is replaced by
-        a new character.
-        
         Returns:
-        (str): The updated game string.
+            (tuple<int>): Grid size, pokemon, pokeballs, unexposed cells, flags and flags
+            on pokemon.
         """
-        self._game = self._game[:index] + character + self._game[index + 1:]
+        return MAPPED_HEADER.unpack(self._header)[1:]
 
-    def neighbour_directions(self, index, grid_size):
-        """Seek out all direction that has a neighbouring cell.
+    def write_header(self, num_pokeballs, num_unexposed, num_flags, num_found):
+        """Stores the pokeballs and running counts, so the game reopens without a scan.
 
         Parameters:
-            index (int): The index in the game string.
-            grid_size (int): The grid size of the game.
+            num_pokeballs (int): The number of pokeballs.
+            num_unexposed (int): The number of unexposed cells.
+            num_flags (int): The number of flags.
+            num_found (int): The number of flags on pokemon.
+        """
+        MAPPED_HEADER.pack_into(self._header, 0, MAPPED_MAGIC, self._grid_size,
+                                len(self.pokemon), num_pokeballs, num_unexposed,
+                                num_flags, num_found)
 
-        Returns:
-            (list<int>): A list of index that has a neighbouring cell.
+    def clear(self):
+        """Sets every cell back to unexposed.
         """
-        neighbours = []
-        for direction in DIRECTIONS:
-            neighbour = self.index_in_direction(index, direction)
-            if neighbour is not None:
-                neighbours.append(neighbour)
+        self._states[:] = bytes(len(self._states))
 
-        return neighbours    
+    def flush(self):
+        """Writes the changes in the mapping out to the file.
+        """
+        self._map.flush()
+
+    def close(self):
+        """Flushes and closes the mapping and the file.
+        """
+        self._map.flush()
+        #The mapping can only be closed once nothing is viewing it
+        for view in reversed(self._views):
+            view.release()
+        self._map.close()
+        self._file.close()
 
-    def index_in_direction(self, index, direction):
-        """The index in the game string is updated by determining the
-        adjacent cell given the direction.
-        The index of the adjacent cell in the game is then calculated and returned.
+
+class MappedBoardModel(BoardModel):
+    """A BoardModel which keeps its game in a memory-mapped file, for the largest boards.
+
+    Cells take two bits of state and one pokemon bit, and the numbers are counted from
+    the pokemon bits when read, so memory does not grow with the grid. The running
+    counts are kept in the file's header, so a saved board reopens with MappedBoardModel.open
+    without being read.
+    """
+    def __init__(self, grid_size, num_pokemon, seed = None, filename = "board.pkmb",
+                 on_change = None):
+        """Initializes the MappedBoardModel, creating its file.
 
         Parameters:
-            index (int): The index in the game string.
-            direction (str): The direction of the adjacent cell.
+        grid_size(int): The grid size of the game.
+        num_pokemon(int): The number of pokemon in the game.
+        seed(int|random.Random): Seed or random number generator used to place the pokemon.
+        filename(str): The file to keep the game in. Any game already in it is replaced.
+        on_change(callable): Function or method to call with each batch of changed cells.
+        """
+        self._filename = filename
+        super().__init__(grid_size, num_pokemon, seed, on_change)
+
+    @classmethod
+    def open(cls, filename):
+        """Opens a saved game without reading its cells.
+
+        Parameters:
+        filename(str): The file of the game.
 
         Returns:
-            (int): The index in the game string corresponding to the new cell position
-            in the game.
+        (MappedBoardModel): The model of the saved game.
+        """
+        model = cls.__new__(cls)
+        model._filename = filename
+        model._on_change = None
+        model._rng = random
+        model._component_cache = {}
+        model._game = MappedGame(filename)
+        model._grid_size, model._num_pokemon, model._num_pokeballs = model._game.read_header()[:3]
+        model.attach_pokemon()
+        return model
 
-            None for invalid direction.
+    def empty_game(self):
+        """Creates the game file with no cells exposed.
+
+        Returns:
+            (MappedGame): The unexposed game.
         """
-        # convert index to row, col coordinate
-        col = index % self._grid_size
-        row = index // self._grid_size
-        if RIGHT in direction:
-            col += 1
-        elif LEFT in direction:
-            col -= 1
-        if UP in direction:
-            row -= 1
-        elif DOWN in direction:
-            row += 1
-        if not (0 <= col < self._grid_size and 0 <= row < self._grid_size):
-            return None
-        return self.position_to_index((row, col))
+        if isinstance(getattr(self, "_game", None), MappedGame):
+            self._game.close()
+        return MappedGame(self._filename, self._grid_size)
 
-    def number_at_cell(self, index):
-        """Calculates what number should be displayed at that specific index in the game.
+    def get_game(self):
+        """Returns the mapped game, as the full game string may not fit in memory.
 
-        Parameters:
-            index (int): Index of the currently selected cell
+        Returns:
+        (MappedGame): The game, indexed like the game string.
+        """
+        return self._game
+
+    def generate_pokemons(self):
+        """Places the pokemon straight into the pokemon bits of the file.
+
+        Uses Floyd's sampling without replacement, so no list of every location is
+        built and this takes one draw per pokemon however full the board is.
 
         Returns:
-            (int): Number to be displayed at the given index in the game string.
+            (PokemonLayer): The pokemon of the game.
         """
-        if self._game[index] != UNEXPOSED:
-            return int(self._game[index]) 
-        number = 0
-        for neighbour in self.neighbour_directions(index, self._grid_size):
-            if neighbour in self._pokemon_locations:
-                number += 1
-        return number    
+        pokemon = self._game.pokemon
+        pokemon.clear()
+        cell_count = self._grid_size ** 2
+        for last in range(cell_count - min(self._num_pokemon, cell_count), cell_count):
+            #Take the last cell of the range instead when the drawn cell is taken
+            if not pokemon.add(self._rng.randrange(last + 1)):
+                pokemon.add(last)
+        return pokemon
+
+    def set_pokemon_locations(self, pokemon_locations):
+        """Stores the pokemon locations in the pokemon bits of the file.
 
-    def big_fun_search(self, index):
-        """Searching adjacent cells to see if there are any Pokemon present.
-        
         Parameters:
-            index (int): Index of the currently selected cell.
+            pokemon_locations (iterable<int>): Index or indices of pokemon locations.
+        """
+        pokemon = self._game.pokemon
+        if pokemon_locations is not pokemon:
+            pokemon_locations = list(pokemon_locations)
+            pokemon.clear()
+            for index in pokemon_locations:
+                pokemon.add(index)
+        self.attach_pokemon()
 
-        Returns:
-            (list<int>): List of cells to turn visible.
+    def attach_pokemon(self):
+        """Uses the pokemon bits and counts of the game file, then counts the cells.
         """
-        queue = [index]
-        discovered = [index]
-        visible = []
-            
-        if self._game[index] == FLAG:
-            return queue
+        self._pokemon_locations = self._game.pokemon
+        self._counts = self._game.counts
+        self.recount()
+        self.store_counts()
 
-        number = self.number_at_cell(index)
-        if number != 0:
-            return queue
+    def store_counts(self):
+        """Writes the pokeballs and running counts into the file header.
+        """
+        self._game.write_header(self._num_pokeballs, self._num_unexposed,
+                                self._num_flags, self._num_found)
 
-        while queue:
-            node = queue.pop()
-            for neighbour in self.neighbour_directions(node, self._grid_size):
-                if neighbour in discovered:
-                    continue
+    def recount(self):
+        """Reads the running counts from the file header, rather than scanning the cells.
+        """
+        self._num_unexposed, self._num_flags, self._num_found = self._game.read_header()[3:]
+        self._constraints = None
+        self._touched = set()
+        self._probabilities = None
 
-                discovered.append(neighbour)
-                if self._game[neighbour] != FLAG:
-                    number = self.number_at_cell(neighbour)
-                    if number == 0:
-                        queue.append(neighbour)
-                visible.append(neighbour)
-        return visible
+    def write_cells(self, changes):
+        """Writes a batch of changed cells into the mapped game and stores the counts.
+
+        Parameters:
+            changes (list<tuple<int, str>>): Index and new character of each changed cell.
+        """
+        self._touched.update(index for index, _ in changes)
+        for index, character in changes:
+            self.count_cell(index, self._game[index], -1)
+            self.count_cell(index, character, 1)
+            self._game[index] = character
+        self.store_counts()
+        self.notify(changes)
+
+    def zero_region(self, index):
+        """Leaves zero regions to be searched, as labelling them keeps a label per cell.
+
+        Parameters:
+            index (int): Index of a cell with no adjacent pokemon.
 
-    def flag_cell(self, index):
-        """Toggle Flag on or off at selected index. If the selected index is already
-        revealed, the game would return with no changes.
-        
         Returns:
-        (str): The updated game string.
+            (None): No precomputed region.
         """
-        if self._game[index] == FLAG:
-            self._game = self._game[:index] + UNEXPOSED + self._game[index + 1:]
+        return None
 
-        elif self._game[index] == UNEXPOSED:
-            self._game = self._game[:index] + FLAG + self._game[index + 1:]
+    def exposed_cells(self):
+        """Finds the exposed cells from the state bits.
 
-    def check_win(self):
-        """Checks if the player has won the game.
-        
         Returns:
-        (bool): True if the player has won the game, false if not.
+            (list<int>): Index of each exposed cell.
         """
-        return UNEXPOSED not in self._game and self._game.count(FLAG) == len(self._pokemon_locations)
-    
-    def check_loss(self, index):
-        """Checks if the player has lost the game and updates the game string accordingly.
-        
+        return self._game.exposed_cells()
+
+    def flagged_cells(self):
+        """Finds the flagged cells from the state bits.
+
         Returns:
-        (bool): True if the player has lost the game, false if not.        
+            (list<int>): Index of each flagged cell.
         """
-        if index in self._pokemon_locations:
-            for i in self._pokemon_locations:
-                self.replace_character_at_index(i, POKEMON)
-            return True            
-        
+        return self._game.flagged_cells()
+
     def reveal_cells(self, index):
         """Reveals all neighbouring cells at index and repeats for all
         cells that had a 0.
 
-        Does not reveal flagged cells or cells with Pokemon.
+        Does not reveal flagged cells or cells with Pokemon. The game string is
+        read out of the file in full, so large games should use flood_reveal and
+        expose_cells instead.
 
         Parameters:
             index (int): Index of the currently selected cell
@@ -265,44 +1827,49 @@ class BoardModel(object):
         Returns:
             (str): The updated game string
         """
+        self.expose_cells(self.flood_reveal(index))
+        return str(self._game)
+
+    def get_counts(self):
+        """Counts the adjacent pokemon of every cell from the pokemon layer.
 
-        number = self.number_at_cell(index)
-        self.replace_character_at_index(index, str(number))
-        clear = self.big_fun_search(index)
-        
-        for i in clear:
-            if self._game[i] in self._pokemon_locations:
-                self.check_loss(index)
-            if self._game[i] != FLAG:
-                number = self.number_at_cell(i)
-                self.replace_character_at_index(i, str(number))
-                    
-        return self._game
-    
-    def reset(self, new):
-        """Resets the game string to its original form.
-        
         Returns:
-        (str): The original game string.
+            (bytes): The count of each index in the game string.
+        """
+        return bytes(adjacency_counts(self._grid_size, self._pokemon_locations))
+
+    def reset(self, new):
+        """Sets the game back to the cells of a game string, such as an unexposed one.
+
+        Parameters:
+            new (str): The game string.
         """
-        self._game = new
+        self._game.clear()
+        cell_count = self._grid_size ** 2
+        self._game.write_header(self._num_pokeballs, cell_count, 0, 0)
+        self.recount()
+        self.write_cells([(index, character) for index, character in enumerate(new[:cell_count])
+                          if character != UNEXPOSED])
 
     def ball_reset(self, ball):
-        """Resets the number of pokeballs to be placed.
-        
-        Returns:
-        (int): Number of pokeballs to be placed.
+        """Resets the number of pokeballs to be placed, storing it in the file.
+
+        Parameters:
+            ball (int): Number of pokeballs to be placed.
         """
-        self._num_pokeballs = ball
+        super().ball_reset(ball)
+        self.store_counts()
 
-    def loc_reset(self, pokemon):
-        """Resets the index or indices of where pokemon are located relative to the game string.
-        
-        Returns:
-        (tuple<int>): index or indicies of pokemon locations.
+    def flush(self):
+        """Writes the game out to its file.
         """
-        self._pokemon_locations = eval(pokemon)
-    
+        self._game.flush()
+
+    def close(self):
+        """Writes the game out and closes its file.
+        """
+        self._game.close()
+
   
 class PokemonGame:
     """Manages the communication between the model and view classes. Represents the controller class.
@@ -319,7 +1886,7 @@ class PokemonGame:
         self._master = master
         self._grid_size = grid_size
         self._num_pokemon = num_pokemon
-        self._model = BoardModel(self._grid_size, self._num_pokemon)
+        self._model = BoardModel(self._grid_size, self._num_pokemon, on_change = self.draw_changes)
         self._game = self._model.get_game()
         self._task = task
         #Initialize task one attributes
@@ -521,7 +2088,7 @@ class PokemonGame:
             fd.write(str(self._grid_size)+"\n")
             fd.write(str(self._num_pokemon)+"\n")
             fd.write(str(self._model._num_pokeballs)+"\n")
-            fd.write(str(self._model._pokemon_locations)+"\n")
+            fd.write(str(tuple(sorted(self._model._pokemon_locations)))+"\n")
             fd.write(str(self._status._minutes)+"\n")
             fd.write(str(self._status._seconds)+"\n")
             fd.close()
@@ -561,38 +2128,36 @@ class PokemonGame:
         self._status.pause_timer()
         self._status.start_timer()
            
-    def select_left(self, position):
+    def select_left(self, index):
         """Handles the left clicking functionality of the game.
         
         Parameters:
-        position(tuple<int>): x,y coordinates of the click on the game board.
+        index(int): Index of the cell clicked in the game string.
         """
-        index = self.get_index(position[1], position[0])
         if self._game[index] == FLAG:
             return
-        #If the game is not over, reveal cells and redraw.
+        #If the game is not over, reveal cells. The model passes the revealed cells to draw_changes.
         elif self.check_game_over(index) == False:
             self._model.reveal_cells(index)
-            self.redraw()
+            self._game = self._model.get_game()
             self.check_game_over(index)            
     
-    def select_right(self, position):
+    def select_right(self, index):
         """Handles the right clicking functionality of the game.
         
         Parameters:
-        position(tuple<int>): x,y coordinates of the click on the game board.
+        index(int): Index of the cell clicked in the game string.
         """
-        index = self.get_index(position[1], position[0])
         #Handle flagging for different game modes.
         if self._task == TASK_ONE:
             self._model.flag_cell(index)
         if self._task == TASK_TWO:
-            if self._game.count(FLAG) < self._model._num_pokeballs or self._game[index] == FLAG:
+            if self._model.get_num_attempted_catches() < self._model._num_pokeballs or self._game[index] == FLAG:
                 self._model.flag_cell(index)
                 self.reset_dynamic_labels()
             else:
                 return
-        self.redraw()
+        self._game = self._model.get_game()
         #Determine the win message to display depending on game mode
         if self._model.check_win():
             if self._task == TASK_ONE:
@@ -601,19 +2166,6 @@ class PokemonGame:
                 self._status.pause_timer()
                 self.win_entry()
        
-    def get_index(self, coord_x, coord_y):
-        """Takes the x and y coordinates of a cell tag click and converts it to the game string index.
-        
-        Parameters:
-        coord_x(str): String representation of the x coordinate of a cell tag click.
-        coord_y(str): String representation of the y coordinate of a cell tag click.
-        
-        Returns:
-        (int): Index of position in the game string.
-        """
-        index = self._model.position_to_index((int(coord_x[0]), int(coord_y[1])))
-        return index
-                                                
     def draw(self):
         """Draws the game board based on the game string.
         """
@@ -627,6 +2179,17 @@ class PokemonGame:
         """
         self._game = self._model.get_game()
         self.draw()
+
+    def draw_changes(self, changes):
+        """Draws only the cells changed by a model operation.
+
+        Parameters:
+        changes(list<tuple<int, str>>): Index and new character of each changed cell.
+        """
+        if self._task == TASK_ONE:
+            self._board.draw_changes(changes)
+        else:
+            self._image_view.draw_changes(changes)
            
     def check_game_over(self, index):
         """Checks if the game has been won or lost.
@@ -648,7 +2211,7 @@ class PokemonGame:
         elif self._model.check_loss(index):
             if self._task == TASK_TWO:
                 self._status.pause_timer()
-            self.redraw()
+            self._game = self._model.get_game()
             self.show_message("lose")
         else: 
             return False
@@ -674,7 +2237,7 @@ class PokemonGame:
         """Resets and creates a new game with different pokemon locations.
         """
         self.restart_game()
-        self._model.__init__(self._grid_size, self._num_pokemon)
+        self._model.__init__(self._grid_size, self._num_pokemon, on_change = self.draw_changes)
         
     def show_message(self, outcome):
         """Creates the win / lose messages to display based on the game mode.
@@ -710,6 +2273,75 @@ class PokemonGame:
         else:
             self._master.destroy()
 
+
+class ImageCache(object):
+    """
+    Decoded images from the images subfolder, kept by name and size so each one is only
+    read from disk and resized once. The least recently used images are dropped once they
+    take up more than the byte budget. A view holds its own reference to every image it
+    shows, so dropping an image from the cache never blanks the board.
+    """
+    def __init__(self, max_bytes = IMAGE_CACHE_BYTES):
+        """Initializes the ImageCache.
+
+        Parameters:
+        max_bytes(int): The number of bytes of decoded images to keep.
+        """
+        self._max_bytes = max_bytes
+        self._images = OrderedDict()
+        self._bytes = 0
+
+    def get(self, image_name, size = None):
+        """Returns an image, reading and resizing it only if it is not cached.
+
+        Parameters:
+        image_name(str): Name of the image.
+        size(tuple<int, int>): Width and height to resize to, or None for the original size.
+
+        Returns:
+        (ImageTk.PhotoImage): Image to display.
+        """
+        key = (image_name, size)
+        cached = self._images.get(key)
+        if cached is not None:
+            self._images.move_to_end(key)
+            return cached[0]
+        image, cost = self.read_image(image_name, size)
+        self._images[key] = (image, cost)
+        self._bytes += cost
+        while self._bytes > self._max_bytes and len(self._images) > 1:
+            self._bytes -= self._images.popitem(last = False)[1][1]
+        return image
+
+    def read_image(self, image_name, size):
+        """Reads an image from disk, resizing it if a size is given.
+
+        Parameters:
+        image_name(str): Name of the image.
+        size(tuple<int, int>): Width and height to resize to, or None for the original size.
+
+        Returns:
+        (tuple<ImageTk.PhotoImage, int>): The image and its size in bytes once decoded.
+        """
+        try:
+            image = Image.open("images/" + image_name + ".png")
+        except OSError:
+            image = Image.open("images/" + image_name + ".gif")
+        if size is not None:
+            image = image.resize(size, Image.LANCZOS)
+        width, height = image.size
+        return ImageTk.PhotoImage(image), width * height * 4
+
+    def clear(self):
+        """Drops every cached image.
+        """
+        self._images.clear()
+        self._bytes = 0
+
+
+#The images shared by every view and the status bar
+IMAGE_CACHE = ImageCache()
+
         
 class BoardView(tk.Canvas):
     """Represents the GUI for the board and the view class.
@@ -721,8 +2353,8 @@ class BoardView(tk.Canvas):
         master(tk.Widget): Widget within which the game is held.
         grid_size(int): Size of game.
         board_width(int): Width of the board. Set to 600 pixels.
-        select_left(callable): Function or method to call when a cell is selected with left click.
-        select_right(callable): Function or method to call when a cell is selected with right click.
+        select_left(callable): Function or method to call with the index of a cell selected with left click.
+        select_right(callable): Function or method to call with the index of a cell selected with right click.
         """
         super().__init__(master, width = board_width, height = board_width, bg = "white", borderwidth = 1, highlightthickness = 0, *args, **kwargs)
         self._master = master
@@ -730,6 +2362,17 @@ class BoardView(tk.Canvas):
         self._board_width = board_width
         self.select_left = select_left
         self.select_right = select_right
+        #Canvas items of each cell, created on the first draw, and the board they show
+        self._cells = None
+        self._drawn = None
+        #Index of the cell under the mouse
+        self._hovered = None
+        #Set bindings once on the canvas, the cell is found from the event position
+        self.bind("<ButtonPress-1>", self.left_event)
+        self.bind("<ButtonPress-2>", self.right_event)
+        self.bind("<ButtonPress-3>", self.right_event)
+        self.bind("<Motion>", self.motion_event)
+        self.bind("<Leave>", self.leave_event)
         
         self._label = tk.Label(self._master, text = "Pokemon: Got 2 Find Them All!", font = ("Courier New", 24, "bold"), fg = "white", bg = "indian red", relief = "raised")
         self._label.pack(side = tk.TOP, fill = tk.BOTH, expand = True)
@@ -737,95 +2380,172 @@ class BoardView(tk.Canvas):
               
     def draw_board(self, board): 
         """Draws the game board in BoardView using coloured rectangles.
+
+        The items of every cell are created on the first draw. After that, only the
+        cells which changed since the last draw are updated with itemconfig, so the
+        canvas keeps the same items however long the game runs.
         
         Parameters:
         board(str): The current game board (game string).
         """
+        if self._cells is None or len(self._cells) != self._grid_size ** 2:
+            self.create_cells()
+        for index in self.changed_cells(board):
+            self.draw_cell(index, board[index])
+        self._drawn = list(board[:len(self._cells)])
+
+    def draw_changes(self, changes):
+        """Draws only the given cells, as passed on from a model operation.
+
+        Parameters:
+        changes(list<tuple<int, str>>): Index and new character of each changed cell.
+        """
+        if self._drawn is None:
+            return
+        for index, character in changes:
+            if self._drawn[index] != character:
+                self.draw_cell(index, character)
+                self._drawn[index] = character
+
+    def create_cells(self):
+        """Deletes any old items and creates the items of every cell.
+        """
+        self.delete("all")
+        self._cells = []
+        self._drawn = None
+        self._hovered = None
         #Set the cell width
         self._cell_width = self._board_width//self._grid_size
-        #Set the cell coordinates for drawing rectangles
-        rec_top_left_x = 0
-        rec_top_left_y = 0
-        rec_bottom_right_x = self._cell_width
-        rec_bottom_right_y = self._cell_width
-        #Set index
-        index = 0
-        
         for j in range(0, self._grid_size, 1):
             for i in range(0, self._grid_size, 1):
-                #Create cell tags
-                cell_tag = str((i, j))
-                coord_i = i + self._cell_width
-                coord_j = j + self._cell_width
-                #Revealed cells
-                if board[index].isdigit():
-                    tag = self.create_rectangle([rec_top_left_x, rec_top_left_y], [rec_bottom_right_x, rec_bottom_right_y], fill = "light green", tags = cell_tag)
-                    self.create_text((rec_top_left_x + 0.5 * self._cell_width, rec_top_left_y + 0.5 * self._cell_width), text = board[index])
-                #Flagged cells
-                elif board[index] == FLAG:
-                    tag = self.create_rectangle([rec_top_left_x, rec_top_left_y], [rec_bottom_right_x, rec_bottom_right_y], fill = "red", tags = cell_tag)
-                #Pokemon cells
-                elif board[index] == POKEMON:
-                    tag = self.create_rectangle([rec_top_left_x, rec_top_left_y], [rec_bottom_right_x, rec_bottom_right_y], fill = "yellow", tags = cell_tag)
-                #Unrevealed cells
-                else:
-                    tag = self.create_rectangle([rec_top_left_x, rec_top_left_y], [rec_bottom_right_x, rec_bottom_right_y], fill = "green", tags = cell_tag)
-                #Set bindings to cell tags
-                self.tag_bind(tag, "<ButtonPress-1>", self.left_event)
-                self.tag_bind(tag, "<ButtonPress-2>", self.right_event)
-                self.tag_bind(tag, "<ButtonPress-3>", self.right_event)
-                self.tag_bind(tag, "<Enter>",  lambda event, border = tag:self.border_event(event, border))
-                self.tag_bind(tag, "<Leave>", lambda event, border = tag:self.border_event(event, border))
-                #Increment index and position for next column of rectangles
-                index += 1  
-                rec_top_left_x += self._cell_width
-                rec_bottom_right_x += self._cell_width
-            #Increment position for next row of rectangles
-            rec_top_left_x = 0
-            rec_top_left_y += self._cell_width
-            rec_bottom_right_x = self._cell_width
-            rec_bottom_right_y += self._cell_width                       
+                self._cells.append(self.create_cell(i * self._cell_width, j * self._cell_width))
+
+    def create_cell(self, left, top):
+        """Creates the rectangle and number of one cell.
+
+        Parameters:
+        left(int): x coordinate of the left of the cell.
+        top(int): y coordinate of the top of the cell.
+
+        Returns:
+        (tuple<int, int>): The rectangle and text items of the cell.
+        """
+        rectangle = self.create_rectangle([left, top], [left + self._cell_width, top + self._cell_width], fill = "green")
+        text = self.create_text((left + 0.5 * self._cell_width, top + 0.5 * self._cell_width), text = "")
+        return rectangle, text
+
+    def changed_cells(self, board):
+        """Finds the cells whose character is different from the last board drawn.
+
+        Parameters:
+        board(str): The current game board (game string).
+
+        Returns:
+        (iterable<int>): Index of each cell to draw again.
+        """
+        cells = range(len(self._cells))
+        if self._drawn is None:
+            return cells
+        drawn = self._drawn
+        return [index for index in cells if board[index] != drawn[index]]
+
+    def draw_cell(self, index, character):
+        """Updates the items of one cell to show its character.
+
+        Parameters:
+        index(int): Index of the cell.
+        character(str): The character of the cell in the game string.
+        """
+        rectangle, text = self._cells[index]
+        #Revealed cells
+        if character.isdigit():
+            self.itemconfig(rectangle, fill = "light green")
+            self.itemconfig(text, text = character)
+            return
+        #Flagged cells
+        elif character == FLAG:
+            self.itemconfig(rectangle, fill = "red")
+        #Pokemon cells
+        elif character == POKEMON:
+            self.itemconfig(rectangle, fill = "yellow")
+        #Unrevealed cells
+        else:
+            self.itemconfig(rectangle, fill = "green")
+        self.itemconfig(text, text = "")
                 
+    def cell_at(self, event):
+        """Finds the cell under the mouse from the position of an event.
+        
+        Parameters:
+        event(tk.Event): The event occurring on the board.
+        
+        Returns:
+        (int): Index of the cell in the game string, or None if the event is off the cells.
+        """
+        if self._cells is None:
+            return None
+        col = event.x // self._cell_width
+        row = event.y // self._cell_width
+        if 0 <= col < self._grid_size and 0 <= row < self._grid_size:
+            return row * self._grid_size + col
+        return None
+
     def left_event(self, event): 
-        """Links the left click bindings to the cell tags and left click functionality.
+        """Passes the cell under a left click to the left click functionality.
         
         Parameters:
         event(tk.Event): The event occurring on the board.
         """
-        #Find closest cell
-        loc = self.find_closest(event.x, event.y)[0]
-        #Get tag
-        cell_tags = self.gettags(loc)
-        #Utilize left click functionality
-        self.select_left(cell_tags)       
+        index = self.cell_at(event)
+        if index is not None and self.select_left is not None:
+            self.select_left(index)
     
     def right_event(self, event):
-        """Links the right click bindings to the cell tags.
+        """Passes the cell under a right click to the right click functionality.
+        
+        Parameters:
+        event(tk.Event): The event occurring on the board.
+        """
+        index = self.cell_at(event)
+        if index is not None and self.select_right is not None:
+            self.select_right(index)
+
+    def motion_event(self, event):
+        """Moves the hover highlight to the cell under the mouse.
         
         Parameters:
         event(tk.Event): The event occurring on the board.
         """
-        #Find closest cell
-        loc = self.find_closest(event.x, event.y)[0]
-        #Get tag
-        cell_tags = self.gettags(loc)
-        #Utilize right click functionality
-        self.select_right(cell_tags)
+        index = self.cell_at(event)
+        if index == self._hovered:
+            return
+        if self._hovered is not None:
+            self.highlight_cell(self._hovered, False)
+        if index is not None:
+            self.highlight_cell(index, True)
+        self._hovered = index
 
-    def border_event(self, event, border):
-        """Changes the colour of a cell when hovered and changes it back when unhovered.
+    def leave_event(self, event):
+        """Removes the hover highlight when the mouse leaves the board.
         
         Parameters:
         event(tk.Event): The event occurring on the board.
-        border(tk.Widget): The rectangle being changed.
         """
-        #Set event values
-        HOVER = '7'
-        UNHOVER = '8'
-        #Change border colour
-        if event.type == HOVER:
+        if self._hovered is not None:
+            self.highlight_cell(self._hovered, False)
+        self._hovered = None
+
+    def highlight_cell(self, index, hovered):
+        """Changes the border colour of a cell when hovered and changes it back when unhovered.
+        
+        Parameters:
+        index(int): Index of the cell.
+        hovered(bool): True if the mouse moved onto the cell, False if it moved off.
+        """
+        border = self._cells[index][0]
+        if hovered:
             self.itemconfig(border, outline = "yellow", width = 2)
-        elif event.type == UNHOVER:
+        else:
             self.itemconfig(border, outline = "black", width = 1)
 
 
@@ -841,96 +2561,77 @@ class ImageBoardView(BoardView):
         self.select_left = select_left
         self.select_right = select_right
         
-    def draw_board(self, board):
-        """Draws the game board in ImageBoardView using images.
-        
-        Parameters:
-        board(str): The current game board (game string).
-        """ 
+    def create_cells(self):
+        """Loads the images for the cell size, then creates the image of every cell.
+        """
         #Set cell width and image resize constants
         self._cell_width = self._board_width//self._grid_size
         self._resized = (self._cell_width, self._cell_width)
-        #Set the cell coordinates for drawing images
-        rec_top_left_x = 0
-        rec_top_left_y = 0
-        rec_bottom_right_x = self._cell_width
-        rec_bottom_right_y = self._cell_width
-        #Set index
-        index = 0
-        #Create image list to store images
-        self._images = []  
         self._unrevealed = self.get_resized_image("unrevealed") 
+        self._unrevealed_moved = self.get_resized_image("unrevealed_moved")
         self._pokeball = self.get_resized_image("pokeball")
         #Create revealed cell image dictionary           
         self._num_dict = self.generate_dict()
-               
-        for j in range(0, self._grid_size, 1):
-            for i in range(0, self._grid_size, 1):
-                cell_tag = str((i, j))
-                #Set centre of cell coordinate for placing images 
-                self._centre_x = rec_top_left_x + 0.5 * self._cell_width
-                self._centre_y = rec_top_left_y + 0.5 * self._cell_width
-                #Revealed images
-                if board[index] in self._num_dict.keys():
-                    #Get corresponding image for index (ie. index of 1 gets image for 1 neighbour).
-                    num_image = self._num_dict[board[index]]
-                    #Store images
-                    self._images.append(num_image)
-                    num_image.image = num_image
-                    tag = self.create_image(self._centre_x, self._centre_y, image = num_image, tags = cell_tag)
-                #Flagged images
-                elif board[index] == FLAG:
-                    tag = self.create_image(self._centre_x, self._centre_y, image = self._pokeball, tags = cell_tag)
-                #Pokemon images
-                elif board[index] == POKEMON:
-                    #Generate random pokemon and store their images
-                    pokemon = self.gen_rand_pokemon()
-                    pokemon_image = self.get_resized_image(pokemon)
-                    self._images.append(pokemon_image)
-                    pokemon_image.image = pokemon_image
-                    tag = self.create_image(self._centre_x, self._centre_y, image = pokemon_image, tags = cell_tag)
-                #Unrevealed images
-                else:
-                    tag = self.create_image(self._centre_x, self._centre_y, image = self._unrevealed, tags = cell_tag)
-                #Set bindings to cell tags
-                self.tag_bind(tag, "<ButtonPress-1>", self.left_event)
-                self.tag_bind(tag, "<ButtonPress-2>", self.right_event)
-                self.tag_bind(tag, "<ButtonPress-3>", self.right_event)
-                if board[index] == UNEXPOSED:
-                    self.tag_bind(tag, "<Enter>",  lambda event, img = tag:self.image_event(event, img))
-                    self.tag_bind(tag, "<Leave>", lambda event, img = tag:self.image_event(event, img))
-                #Increment index and position for next column of images
-                index += 1  
-                rec_top_left_x += self._cell_width
-                rec_bottom_right_x += self._cell_width
-            #Increment position for next row of images
-            rec_top_left_x = 0
-            rec_top_left_y += self._cell_width
-            rec_bottom_right_x = self._cell_width          
-            rec_bottom_right_y += self._cell_width
-
-
-    def image_event(self, event, img):
+        #Pokemon images shown, by index, so they are kept while on the canvas
+        self._images = {}
+        BoardView.create_cells(self)
+
+    def create_cell(self, left, top):
+        """Creates the image of one cell.
+
+        Parameters:
+        left(int): x coordinate of the left of the cell.
+        top(int): y coordinate of the top of the cell.
+
+        Returns:
+        (tuple<int>): The image item of the cell.
+        """
+        #Set centre of cell coordinate for placing images 
+        centre_x = left + 0.5 * self._cell_width
+        centre_y = top + 0.5 * self._cell_width
+        return (self.create_image(centre_x, centre_y, image = self._unrevealed),)
+
+    def draw_cell(self, index, character):
+        """Updates the image of one cell to show its character.
+
+        Parameters:
+        index(int): Index of the cell.
+        character(str): The character of the cell in the game string.
+        """
+        tag = self._cells[index][0]
+        self._images.pop(index, None)
+        #Revealed images
+        if character in self._num_dict.keys():
+            #Get corresponding image for index (ie. index of 1 gets image for 1 neighbour).
+            self.itemconfig(tag, image = self._num_dict[character])
+        #Flagged images
+        elif character == FLAG:
+            self.itemconfig(tag, image = self._pokeball)
+        #Pokemon images
+        elif character == POKEMON:
+            #Generate random pokemon and store their images
+            pokemon_image = self.get_resized_image(self.gen_rand_pokemon())
+            self._images[index] = pokemon_image
+            self.itemconfig(tag, image = pokemon_image)
+        #Unrevealed images
+        else:
+            self.itemconfig(tag, image = self._unrevealed)
+
+    def highlight_cell(self, index, hovered):
         """Changes the image of a cell when hovered and changes it back when unhovered.
         
         Parameters:
-        event(tk.Event): The event occurring on the board.
-        img(tk.Widget): The image being changed.
-        """
-        #Set event values
-        HOVER = '7'
-        UNHOVER = '8'
-        #Change image
-        if event.type == HOVER:
-            unrevealed_moved = self.get_resized_image("unrevealed_moved")
-            self._images.append(unrevealed_moved)
-            unrevealed_moved.image = unrevealed_moved
-            self.itemconfig(img, image = unrevealed_moved)
-        elif event.type == UNHOVER:
-            unrevealed = self.get_resized_image("unrevealed")
-            self._images.append(unrevealed)
-            unrevealed.image = unrevealed
-            self.itemconfig(img, image = unrevealed)
+        index(int): Index of the cell.
+        hovered(bool): True if the mouse moved onto the cell, False if it moved off.
+        """
+        #Only unrevealed cells are highlighted
+        if self._drawn is None or self._drawn[index] != UNEXPOSED:
+            return
+        #Swap between the two images loaded with the cells
+        if hovered:
+            self.itemconfig(self._cells[index][0], image = self._unrevealed_moved)
+        else:
+            self.itemconfig(self._cells[index][0], image = self._unrevealed)
     
     def gen_rand_pokemon(self):
         """Generates a random pokemon from the pokemon sprites subfolder.
@@ -945,7 +2646,8 @@ class ImageBoardView(BoardView):
         return  file
     
     def get_resized_image(self, image_name):
-        """Retrieves images from the images subfolder and resizes them to fit the game board.
+        """Retrieves images from the images subfolder resized to fit the game board,
+        from the image cache after the first time.
         
         Paramaters:
         image_name(str): name of the image to retrieve.
@@ -953,11 +2655,7 @@ class ImageBoardView(BoardView):
         Returns:
         (ImageTk.PhotoImage): Image to display.
         """
-        try:
-            image = ImageTk.PhotoImage((Image.open("images/" + image_name + ".png")).resize(self._resized, Image.ANTIALIAS))
-        except tk.TclError:
-            image = ImageTk.PhotoImage((Image.open("images/" + image_name +  ".gif")).resize(self._resized, Image.ANTIALIAS))
-        return image
+        return IMAGE_CACHE.get(image_name, self._resized)
     
     def generate_dict(self):
         """Generates a dictionary of the different revealed cell images.
@@ -1119,7 +2817,7 @@ class StatusBar(tk.Frame):
         
             
 def get_image(image_name):
-    """Retrieves an image in its original size.
+    """Retrieves an image in its original size, from the image cache after the first time.
     
     Parameters:
     image_name(str): Name of the image.
@@ -1127,11 +2825,7 @@ def get_image(image_name):
     Returns:
     image(ImageTk.PhotoImage): Image to be displayed.
     """
-    try:
-        image = ImageTk.PhotoImage((Image.open("images/" + image_name + ".png")))
-    except tk.TclError:
-        image = ImageTk.PhotoImage((Image.open("images/" + image_name +  ".gif")))
-    return image
+    return IMAGE_CACHE.get(image_name)
         
 
 def main():
@@ -0,0 +1,339 @@
+"""
+A NumPy engine which plays many boards of the same size in lockstep.
+
+The boards are stored as stacked arrays: the pokemon, adjacent pokemon counts,
+exposed cells and flagged cells, each of shape (boards, grid_size, grid_size).
+Each operation takes one index per board and runs as array operations across the
+whole batch, with the same results as BoardModel.reveal_cells, flag_cell,
+check_loss and check_win on each board.
+
+The boards can also be graded without being played, by their 3BV: the fewest clicks
+which clear a board, one for each zero region and one for each number not next to
+a zero region.
+
+Needs numpy, unlike a3 which only uses it when it is installed.
+
+Run with 'python batch.py [--grid-size N] [--pokemon N] [--boards N] [--seed N]' to
+grade a run of seeded boards.
+"""
+import argparse
+import random
+from time import perf_counter
+import numpy as np
+from a3 import DIRECTION_OFFSETS, FLAG, POKEMON, UNEXPOSED
+
+#An index given for a board which takes no part in an operation
+NO_MOVE = -1
+#Boards graded at once by grade_seeds
+GRADE_BATCH_SIZE = 4096
+
+
+def dilate(cells):
+    """Marks every cell next to or on a marked cell, for a batch of boards.
+
+    Parameters:
+        cells (np.ndarray<bool>): Marked cells, of shape (boards, grid_size, grid_size).
+
+    Returns:
+        (np.ndarray<bool>): The marked cells and their neighbours.
+    """
+    grid_size = cells.shape[1]
+    padded = np.zeros((cells.shape[0], grid_size + 2, grid_size + 2), dtype = bool)
+    padded[:, 1:-1, 1:-1] = cells
+    dilated = cells.copy()
+    for row_offset, col_offset in DIRECTION_OFFSETS.values():
+        dilated |= padded[:, 1 + row_offset:1 + row_offset + grid_size,
+                          1 + col_offset:1 + col_offset + grid_size]
+    return dilated
+
+
+def spread_max(labels):
+    """Takes the largest label among each cell and its neighbours, for a batch of boards.
+
+    Parameters:
+        labels (np.ndarray<int>): Labels of shape (boards, grid_size, grid_size).
+
+    Returns:
+        (np.ndarray<int>): The largest label around each cell.
+    """
+    grid_size = labels.shape[1]
+    padded = np.zeros((labels.shape[0], grid_size + 2, grid_size + 2), dtype = labels.dtype)
+    padded[:, 1:-1, 1:-1] = labels
+    spread = labels.copy()
+    for row_offset, col_offset in DIRECTION_OFFSETS.values():
+        np.maximum(spread, padded[:, 1 + row_offset:1 + row_offset + grid_size,
+                                  1 + col_offset:1 + col_offset + grid_size], out = spread)
+    return spread
+
+
+class BatchBoards(object):
+    """
+    Stores and plays a batch of boards of the same grid size.
+    """
+    def __init__(self, grid_size, pokemon_locations):
+        """Initializes the BatchBoards with every cell unexposed.
+
+        Parameters:
+        grid_size(int): The grid size of every board.
+        pokemon_locations(iterable<iterable<int>>): Index or indices of pokemon locations
+        on each board.
+        """
+        self._grid_size = grid_size
+        pokemon_locations = [np.fromiter(locations, dtype = np.int64)
+                             for locations in pokemon_locations]
+        boards = len(pokemon_locations)
+        shape = (boards, grid_size, grid_size)
+        pokemon = np.zeros((boards, grid_size ** 2), dtype = bool)
+        for board, locations in enumerate(pokemon_locations):
+            pokemon[board, locations] = True
+        self._pokemon = pokemon.reshape(shape)
+
+        padded = np.zeros((boards, grid_size + 2, grid_size + 2), dtype = np.uint8)
+        padded[:, 1:-1, 1:-1] = self._pokemon
+        self._counts = np.zeros(shape, dtype = np.uint8)
+        for row_offset, col_offset in DIRECTION_OFFSETS.values():
+            self._counts += padded[:, 1 + row_offset:1 + row_offset + grid_size,
+                                   1 + col_offset:1 + col_offset + grid_size]
+        self._zero = self._counts == 0
+
+        self._exposed = np.zeros(shape, dtype = bool)
+        self._flagged = np.zeros(shape, dtype = bool)
+        self._lost = np.zeros(boards, dtype = bool)
+
+    @classmethod
+    def from_seeds(cls, grid_size, num_pokemon, seeds):
+        """Creates a batch with the same pokemon as a BoardModel made with each seed.
+
+        Parameters:
+        grid_size(int): The grid size of every board.
+        num_pokemon(int): The number of pokemon on each board.
+        seeds(iterable<int>): Seed of each board.
+
+        Returns:
+        (BatchBoards): The batch of boards.
+        """
+        cell_count = grid_size ** 2
+        return cls(grid_size, [random.Random(seed).sample(range(cell_count),
+                                                           min(num_pokemon, cell_count))
+                               for seed in seeds])
+
+    def __len__(self):
+        return len(self._lost)
+
+    def get_grid_size(self):
+        """Returns the grid size of the boards.
+
+        Returns:
+        (int): The grid size of every board.
+        """
+        return self._grid_size
+
+    def cell_mask(self, indices):
+        """Marks the cell at an index on each board.
+
+        Parameters:
+            indices (array-like<int>): Index of the cell on each board, or NO_MOVE.
+
+        Returns:
+            (np.ndarray<bool>): A mask of shape (boards, grid_size, grid_size) marking
+            the cell of each board with a move.
+        """
+        indices = np.asarray(indices, dtype = np.int64)
+        moves = np.flatnonzero(indices != NO_MOVE)
+        mask = np.zeros((len(self), self._grid_size ** 2), dtype = bool)
+        mask[moves, indices[moves]] = True
+        return mask.reshape(self._exposed.shape)
+
+    def reveal_cells(self, indices):
+        """Reveals the selected cell on each board, flooding out from cells with a 0.
+
+        Every flood grows by one step per pass for the whole batch, until no board's
+        zero region grows any more. Does not reveal flagged cells.
+
+        Parameters:
+            indices (array-like<int>): Index of the selected cell on each board, or NO_MOVE.
+
+        Returns:
+            (np.ndarray<bool>): The newly exposed cells of each board.
+        """
+        selected = self.cell_mask(indices)
+        selected &= ~self._flagged
+        shown = self.shown_pokemon()
+        open_cells = self._zero & ~self._flagged
+        region = selected & self._zero
+        while True:
+            grown = dilate(region) & open_cells
+            grown |= region
+            if np.array_equal(grown, region):
+                break
+            region = grown
+        revealed = (dilate(region) & ~self._flagged) | selected
+        revealed &= ~(self._exposed | shown)
+        self._exposed |= revealed
+        return revealed
+
+    def flag_cell(self, indices):
+        """Toggles the flag at the selected cell on each board. Exposed cells are left alone.
+
+        Parameters:
+            indices (array-like<int>): Index of the selected cell on each board, or NO_MOVE.
+        """
+        selected = self.cell_mask(indices)
+        self._flagged ^= selected & ~(self._exposed | self.shown_pokemon())
+
+    def check_loss(self, indices):
+        """Checks which boards are lost by selecting a pokemon, and marks them as lost.
+
+        As in BoardModel, every pokemon of a lost board is shown in place of its cell.
+
+        Parameters:
+            indices (array-like<int>): Index of the selected cell on each board, or NO_MOVE.
+
+        Returns:
+            (np.ndarray<bool>): True for each board lost by its selection.
+        """
+        selected = self.cell_mask(indices)
+        lost = (selected & self._pokemon).any(axis = (1, 2))
+        self._lost |= lost
+        shown = self.shown_pokemon()
+        self._exposed &= ~shown
+        self._flagged &= ~shown
+        return lost
+
+    def shown_pokemon(self):
+        """Marks the pokemon shown on the lost boards.
+
+        Returns:
+            (np.ndarray<bool>): The shown pokemon, of shape (boards, grid_size, grid_size).
+        """
+        return self._pokemon & self._lost[:, None, None]
+
+    def check_win(self):
+        """Checks which boards have been won.
+
+        A board is won when every cell is exposed or flagged and the flags are exactly
+        on the pokemon.
+
+        Returns:
+            (np.ndarray<bool>): True for each board that has been won.
+        """
+        covered = (self._exposed | self._flagged).all(axis = (1, 2))
+        found = (self._flagged == self._pokemon).all(axis = (1, 2))
+        return covered & found & ~self._lost
+
+    def zero_regions(self):
+        """Counts the connected regions of cells with no adjacent pokemon on each board.
+
+        Only cells without a pokemon are counted, as a pokemon is never clicked. Every
+        zero cell starts with its own label and takes the largest label around
+        it, jumping on to the label of the cell it points at, until no label changes.
+        Each region is then left labelled by its last cell.
+
+        Returns:
+            (np.ndarray<int>): The number of zero regions of each board.
+        """
+        boards = len(self)
+        cells = self._grid_size ** 2
+        zero = self.safe_zeros().reshape(boards, cells)
+        own = np.arange(1, cells + 1, dtype = np.int32)
+        labels = np.where(zero, own, 0).astype(np.int32)
+        rows = np.arange(boards)[:, None]
+        while True:
+            spread = spread_max(labels.reshape(self._pokemon.shape)).reshape(boards, cells)
+            spread = np.where(zero, spread, 0)
+            #A label is the number of a cell of the same region, which has a label at least as large
+            jumped = np.where(zero, spread[rows, np.maximum(spread - 1, 0)], 0)
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        return (zero & (labels == own)).sum(axis = 1)
+
+    def safe_zeros(self):
+        """Marks the cells with no adjacent pokemon and no pokemon of their own.
+
+        Returns:
+            (np.ndarray<bool>): The safe zero cells, of shape (boards, grid_size, grid_size).
+        """
+        return self._zero & ~self._pokemon
+
+    def isolated_numbers(self):
+        """Counts the numbered cells which are not next to a zero region on each board.
+
+        Each of them has to be clicked on its own to clear the board.
+
+        Returns:
+            (np.ndarray<int>): The number of isolated numbers of each board.
+        """
+        isolated = ~(self._pokemon | dilate(self.safe_zeros()))
+        return isolated.sum(axis = (1, 2))
+
+    def three_bv(self):
+        """Works out the 3BV of each board, the fewest clicks which clear it.
+
+        Returns:
+            (tuple<np.ndarray<int>, np.ndarray<int>, np.ndarray<int>>): The 3BV, zero
+            regions and isolated numbers of each board.
+        """
+        regions = self.zero_regions()
+        isolated = self.isolated_numbers()
+        return regions + isolated, regions, isolated
+
+    def get_game(self, board):
+        """Builds the game string of one board, as BoardModel would show it.
+
+        Parameters:
+            board (int): The number of the board.
+
+        Returns:
+            (str): The string representation of the board.
+        """
+        game = np.full(self._grid_size ** 2, UNEXPOSED)
+        exposed = self._exposed[board].ravel()
+        game[exposed] = self._counts[board].ravel()[exposed].astype(str)
+        game[self._flagged[board].ravel()] = FLAG
+        game[self.shown_pokemon()[board].ravel()] = POKEMON
+        return "".join(game)
+
+
+def grade_seeds(grid_size, num_pokemon, seeds, batch_size = GRADE_BATCH_SIZE):
+    """Works out the 3BV of the boards BoardModel would make from each seed, a batch at a time.
+
+    Parameters:
+    grid_size(int): The grid size of the boards.
+    num_pokemon(int): The number of pokemon on each board.
+    seeds(iterable<int>): Seed of each board.
+    batch_size(int): The number of boards graded at once.
+
+    Returns:
+    (generator<tuple<list<int>, np.ndarray<int>, np.ndarray<int>, np.ndarray<int>>>):
+    The seeds of each batch, with the 3BV, zero regions and isolated numbers of their boards.
+    """
+    seeds = iter(seeds)
+    while True:
+        batch = [seed for _, seed in zip(range(batch_size), seeds)]
+        if not batch:
+            return
+        yield (batch,) + BatchBoards.from_seeds(grid_size, num_pokemon, batch).three_bv()
+
+
+def main():
+    """Grades a run of seeded boards and reports their 3BV and boards per second.
+    """
+    parser = argparse.ArgumentParser(description = "Grade seeded boards by their 3BV.")
+    parser.add_argument("--grid-size", type = int, default = 10, help = "grid size of each board")
+    parser.add_argument("--pokemon", type = int, default = 15, help = "pokemon on each board")
+    parser.add_argument("--boards", type = int, default = 100000, help = "number of boards to grade")
+    parser.add_argument("--seed", type = int, default = 0, help = "seed of the first board")
+    args = parser.parse_args()
+
+    start = perf_counter()
+    three_bv = np.concatenate([scores for _, scores, _, _ in grade_seeds(
+        args.grid_size, args.pokemon, range(args.seed, args.seed + args.boards))])
+    seconds = perf_counter() - start
+    print(f"{len(three_bv)} boards, 3BV from {three_bv.min()} to {three_bv.max()}, "
+          f"mean {three_bv.mean():.1f}")
+    print(f"{len(three_bv) / max(seconds, 1e-9):.0f} boards per second")
+
+
+if __name__ == "__main__":
+    main()
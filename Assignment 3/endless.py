@@ -0,0 +1,365 @@
+"""
+An endless board for the minesweeper model, which grows in every direction as it is played.
+
+The board is split into square chunks. The pokemon of a chunk are generated from the
+seed and the chunk's coordinates the first time play reaches it, so they are the same
+every time the chunk is looked at. Only the most recently used chunks are kept in
+memory. A chunk the player has changed is written to disk, compressed, when it is
+evicted, and read back when play returns to it, so memory stays bounded however far
+the player goes.
+
+Cells are given by (row, column) positions, which may be negative.
+"""
+import os
+import random
+import tempfile
+import zlib
+from collections import OrderedDict
+from a3 import DIRECTION_OFFSETS, FLAG, POKEMON, UNEXPOSED
+
+CHUNK_SIZE = 32
+DENSITY = 0.15
+#Chunks kept in memory before the least recently used is evicted
+MAX_CHUNKS = 64
+#Cells one flood may expose, as a low density can make a zero region endless
+MAX_FLOOD = 100000
+
+#States of a cell, one byte per cell of a chunk
+UNEXPOSED_STATE = 0
+FLAG_STATE = 1
+EXPOSED_STATE = 2
+POKEMON_STATE = 3
+
+
+class Chunk(object):
+    """
+    The pokemon, adjacent counts and cell states of one chunk.
+    """
+    def __init__(self, pokemon, counts, states):
+        """Initializes the Chunk.
+
+        Parameters:
+        pokemon(frozenset<int>): Index of each pokemon within the chunk.
+        counts(bytearray): The number of adjacent pokemon of each cell.
+        states(bytearray): The state of each cell.
+        """
+        self.pokemon = pokemon
+        self.counts = counts
+        self.states = states
+        #Whether the states have changed since the chunk was last written to disk
+        self.changed = False
+
+
+class EndlessBoard(object):
+    """
+    Stores and manages an endless game, loading chunks as play reaches them.
+    """
+    def __init__(self, seed, density = DENSITY, chunk_size = CHUNK_SIZE,
+                 max_chunks = MAX_CHUNKS, directory = None):
+        """Initializes the EndlessBoard.
+
+        Parameters:
+        seed(int): Seed the pokemon of every chunk are generated from.
+        density(float): The share of cells holding a pokemon.
+        chunk_size(int): The number of rows and columns in each chunk.
+        max_chunks(int): The number of chunks kept in memory.
+        directory(str): Folder for the evicted chunks. A temporary folder, removed by
+        close, is used when not given.
+        """
+        self._seed = seed
+        self._chunk_size = chunk_size
+        self._pokemon_per_chunk = round(density * chunk_size ** 2)
+        self._max_chunks = max_chunks
+        self._temporary = None
+        if directory is None:
+            self._temporary = tempfile.TemporaryDirectory(prefix = "endless")
+            directory = self._temporary.name
+        os.makedirs(directory, exist_ok = True)
+        self._directory = directory
+        self._chunks = OrderedDict()
+        self._lost = False
+
+    def chunk_position(self, position):
+        """Finds the chunk holding a cell and the cell's index within the chunk.
+
+        Parameters:
+            position (tuple<int, int>): Row and column of the cell.
+
+        Returns:
+            (tuple<tuple<int, int>, int>): The chunk's row and column, and the index.
+        """
+        row, col = position
+        chunk_row, local_row = divmod(row, self._chunk_size)
+        chunk_col, local_col = divmod(col, self._chunk_size)
+        return (chunk_row, chunk_col), local_row * self._chunk_size + local_col
+
+    def generate_pokemons(self, key):
+        """Generates the pokemon of a chunk from the seed and the chunk's coordinates.
+
+        Parameters:
+            key (tuple<int, int>): Row and column of the chunk.
+
+        Returns:
+            (frozenset<int>): Index of each pokemon within the chunk.
+        """
+        rng = random.Random(f"{self._seed}:{key[0]}:{key[1]}")
+        return frozenset(rng.sample(range(self._chunk_size ** 2), self._pokemon_per_chunk))
+
+    def count_chunk(self, key, pokemon):
+        """Counts the pokemon adjacent to every cell of a chunk.
+
+        The pokemon of the eight chunks around it are generated as well, so the cells
+        on the chunk's border are counted across it.
+
+        Parameters:
+            key (tuple<int, int>): Row and column of the chunk.
+            pokemon (frozenset<int>): Index of each pokemon within the chunk.
+
+        Returns:
+            (bytearray): The number of adjacent pokemon of each cell.
+        """
+        size = self._chunk_size
+        chunk_row, chunk_col = key
+        counts = bytearray(size ** 2)
+        for row_step in (-1, 0, 1):
+            for col_step in (-1, 0, 1):
+                other = (chunk_row + row_step, chunk_col + col_step)
+                others = pokemon if other == key else self.generate_pokemons(other)
+                for index in others:
+                    row, col = divmod(index, size)
+                    row += row_step * size
+                    col += col_step * size
+                    for row_offset, col_offset in DIRECTION_OFFSETS.values():
+                        if 0 <= row + row_offset < size and 0 <= col + col_offset < size:
+                            counts[(row + row_offset) * size + col + col_offset] += 1
+        return counts
+
+    def chunk_file(self, key):
+        """Returns the file an evicted chunk is written to.
+
+        Parameters:
+            key (tuple<int, int>): Row and column of the chunk.
+
+        Returns:
+            (str): The path of the chunk's file.
+        """
+        return os.path.join(self._directory, f"{key[0]}_{key[1]}.chunk")
+
+    def load_chunk(self, key):
+        """Returns a chunk, generating it or reading it back from disk if it is not loaded.
+
+        The chunk becomes the most recently used, and the least recently used chunks
+        are evicted past the budget.
+
+        Parameters:
+            key (tuple<int, int>): Row and column of the chunk.
+
+        Returns:
+            (Chunk): The chunk.
+        """
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+        pokemon = self.generate_pokemons(key)
+        filename = self.chunk_file(key)
+        if os.path.exists(filename):
+            with open(filename, "rb") as file:
+                states = bytearray(zlib.decompress(file.read()))
+        else:
+            states = bytearray(self._chunk_size ** 2)
+        chunk = Chunk(pokemon, self.count_chunk(key, pokemon), states)
+        self._chunks[key] = chunk
+        while len(self._chunks) > self._max_chunks:
+            self.evict_chunk(next(iter(self._chunks)))
+        return chunk
+
+    def evict_chunk(self, key):
+        """Drops a chunk from memory, writing its states to disk if they have changed.
+
+        Parameters:
+            key (tuple<int, int>): Row and column of the chunk.
+        """
+        chunk = self._chunks.pop(key)
+        if chunk.changed:
+            self.write_chunk(key, chunk)
+
+    def write_chunk(self, key, chunk):
+        """Writes the compressed states of a chunk to its file.
+
+        Parameters:
+            key (tuple<int, int>): Row and column of the chunk.
+            chunk (Chunk): The chunk.
+        """
+        with open(self.chunk_file(key), "wb") as file:
+            file.write(zlib.compress(bytes(chunk.states)))
+        chunk.changed = False
+
+    def save(self):
+        """Writes every changed chunk still in memory to disk.
+        """
+        for key, chunk in self._chunks.items():
+            if chunk.changed:
+                self.write_chunk(key, chunk)
+
+    def close(self):
+        """Saves the board, and removes the chunk folder if it is a temporary one.
+        """
+        self.save()
+        self._chunks.clear()
+        if self._temporary is not None:
+            self._temporary.cleanup()
+
+    def loaded_chunks(self):
+        """Returns the number of chunks held in memory.
+
+        Returns:
+        (int): The number of loaded chunks.
+        """
+        return len(self._chunks)
+
+    def cell(self, position):
+        """Finds the chunk and index of a cell, loading the chunk.
+
+        Parameters:
+            position (tuple<int, int>): Row and column of the cell.
+
+        Returns:
+            (tuple<Chunk, int>): The chunk and the index within it.
+        """
+        key, index = self.chunk_position(position)
+        return self.load_chunk(key), index
+
+    def character_at(self, position):
+        """Returns the character shown for a cell, as in the BoardModel game string.
+
+        Parameters:
+            position (tuple<int, int>): Row and column of the cell.
+
+        Returns:
+            (str): The number, flag, pokemon or unexposed character.
+        """
+        chunk, index = self.cell(position)
+        state = chunk.states[index]
+        if state == EXPOSED_STATE:
+            return str(chunk.counts[index])
+        return {UNEXPOSED_STATE: UNEXPOSED, FLAG_STATE: FLAG, POKEMON_STATE: POKEMON}[state]
+
+    def get_window(self, top, left, rows, columns):
+        """Builds the game string of a rectangle of the board, for display.
+
+        Parameters:
+            top (int): Row of the top of the rectangle.
+            left (int): Column of the left of the rectangle.
+            rows (int): The number of rows.
+            columns (int): The number of columns.
+
+        Returns:
+            (str): The characters of the rectangle, row by row.
+        """
+        return "".join(self.character_at((row, col))
+                       for row in range(top, top + rows)
+                       for col in range(left, left + columns))
+
+    def number_at_cell(self, position):
+        """Returns the number of pokemon adjacent to a cell.
+
+        Parameters:
+            position (tuple<int, int>): Row and column of the cell.
+
+        Returns:
+            (int): The number of adjacent pokemon.
+        """
+        chunk, index = self.cell(position)
+        return chunk.counts[index]
+
+    def set_state(self, chunk, index, state):
+        """Changes the state of a cell and marks its chunk as changed.
+
+        Parameters:
+            chunk (Chunk): The chunk of the cell.
+            index (int): The index of the cell within the chunk.
+            state (int): The new state.
+        """
+        chunk.states[index] = state
+        chunk.changed = True
+
+    def flag_cell(self, position):
+        """Toggle Flag on or off at a cell. Exposed cells are left alone.
+
+        Parameters:
+            position (tuple<int, int>): Row and column of the cell.
+        """
+        chunk, index = self.cell(position)
+        if chunk.states[index] == FLAG_STATE:
+            self.set_state(chunk, index, UNEXPOSED_STATE)
+        elif chunk.states[index] == UNEXPOSED_STATE:
+            self.set_state(chunk, index, FLAG_STATE)
+
+    def check_loss(self, position):
+        """Checks if a selected cell holds a pokemon, showing it if so.
+
+        Parameters:
+            position (tuple<int, int>): Row and column of the cell.
+
+        Returns:
+            (bool): True if the player has lost the game, false if not.
+        """
+        chunk, index = self.cell(position)
+        if index in chunk.pokemon:
+            self.set_state(chunk, index, POKEMON_STATE)
+            self._lost = True
+            return True
+        return False
+
+    def is_lost(self):
+        """Returns whether a pokemon has been selected.
+
+        Returns:
+        (bool): True if the game has been lost.
+        """
+        return self._lost
+
+    def reveal_cells(self, position, max_flood = MAX_FLOOD):
+        """Reveals a cell, flooding out from cells with a 0 across chunk borders.
+
+        The flood is the same as BoardModel.flood_reveal. It does not reveal flagged
+        cells, and stops growing once max_flood cells have been exposed.
+
+        Parameters:
+            position (tuple<int, int>): Row and column of the selected cell.
+            max_flood (int): The most cells to expose.
+
+        Returns:
+            (list<tuple<tuple<int, int>, int>>): Position and number of each exposed cell.
+        """
+        chunk, index = self.cell(position)
+        state = chunk.states[index]
+        if state == FLAG_STATE:
+            return []
+        revealed = []
+        if state == UNEXPOSED_STATE:
+            self.set_state(chunk, index, EXPOSED_STATE)
+            revealed.append((position, chunk.counts[index]))
+        if chunk.counts[index] != 0:
+            return revealed
+
+        discovered = {position}
+        queue = [position]
+        while queue and len(revealed) < max_flood:
+            row, col = queue.pop()
+            for row_offset, col_offset in DIRECTION_OFFSETS.values():
+                neighbour = (row + row_offset, col + col_offset)
+                if neighbour in discovered:
+                    continue
+                discovered.add(neighbour)
+                chunk, index = self.cell(neighbour)
+                state = chunk.states[index]
+                if state == FLAG_STATE:
+                    continue
+                if chunk.counts[index] == 0:
+                    queue.append(neighbour)
+                if state == UNEXPOSED_STATE:
+                    self.set_state(chunk, index, EXPOSED_STATE)
+                    revealed.append((neighbour, chunk.counts[index]))
+        return revealed
@@ -0,0 +1,193 @@
+"""
+A Monte Carlo simulator which plays seeded solver games across a process pool to
+build win-rate tables.
+
+Every (grid_size, num_pokemon) setting is split into batches of seeded games. Each
+worker plays a whole batch per task, and each finished batch is appended to a summary
+file as one line of JSON. Batches already in the summary file are skipped, so an
+interrupted run carries on where it stopped when started again.
+
+Run with 'python simulator.py [--games N] [--batch-size N] [--workers N] [--summary FILE]'.
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from solver import run_games
+
+#Settings played by default, starting with the defaults of PokemonGame
+SETTINGS = ((10, 15), (10, 10), (10, 20), (16, 40), (30, 99))
+GAMES = 100000
+BATCH_SIZE = 1000
+SUMMARY_FILE = "simulation_summary.jsonl"
+
+
+def play_batch(grid_size, num_pokemon, batch, batch_size, size, seed):
+    """Plays one batch of games. Runs in a worker process.
+
+    The seeds of a batch only depend on its number, so a batch can be replayed
+    exactly.
+
+    Parameters:
+    grid_size(int): The grid size of the games.
+    num_pokemon(int): The number of pokemon in each game.
+    batch(int): The number of the batch.
+    batch_size(int): The number of games in each full batch.
+    size(int): The number of games in this batch, less than batch_size for the last one.
+    seed(int): Seed of the first game of the first batch.
+
+    Returns:
+    (dict<str, float>): The setting and batch, with the results of run_games.
+    """
+    first = seed + batch * batch_size
+    results = run_games(grid_size, num_pokemon, range(first, first + size))
+    results.update(grid_size = grid_size, num_pokemon = num_pokemon, batch = batch,
+                   batch_size = batch_size, size = size, seed = seed)
+    return results
+
+
+def batch_key(results):
+    """Returns the key of a finished batch.
+
+    Parameters:
+    results(dict<str, float>): The results of the batch, as returned by play_batch.
+
+    Returns:
+    (tuple<int, int, int, int>): The grid size, number of pokemon, batch and size.
+    """
+    return (results["grid_size"], results["num_pokemon"], results["batch"],
+            results.get("size", results["batch_size"]))
+
+
+def batch_sizes(games, batch_size):
+    """Splits the games of a setting into batches.
+
+    Parameters:
+    games(int): The number of games to play.
+    batch_size(int): The number of games in each full batch.
+
+    Returns:
+    (list<int>): The number of games in each batch. Only the last may be short.
+    """
+    batches = -(-games // batch_size)
+    return [min(batch_size, games - batch * batch_size) for batch in range(batches)]
+
+
+def load_summary(filename, batch_size, seed):
+    """Reads the batches already finished from a summary file.
+
+    A line cut short by an interrupted run is ignored, so its batch is played again.
+    So are batches played with a different batch size or seed, as they hold other games.
+    Batches are kept by their size as well, so a short last batch is not taken for a
+    full one when the number of games changes.
+
+    Parameters:
+    filename(str): The summary file.
+    batch_size(int): The number of games in each batch.
+    seed(int): Seed of the first game of the first batch.
+
+    Returns:
+    (dict<tuple<int, int, int, int>, dict>): The results of each
+    (grid_size, num_pokemon, batch, size).
+    """
+    finished = {}
+    if not os.path.exists(filename):
+        return finished
+    line = "\n"
+    with open(filename, encoding = "utf-8") as file:
+        for line in file:
+            try:
+                results = json.loads(line)
+            except ValueError:
+                continue
+            if (results["batch_size"], results["seed"]) != (batch_size, seed):
+                continue
+            finished[batch_key(results)] = results
+    #End a cut short line, so the next batch added starts on a line of its own
+    if not line.endswith("\n"):
+        with open(filename, "a", encoding = "utf-8") as file:
+            file.write("\n")
+    return finished
+
+
+def simulate(settings, games, batch_size, summary, workers = None, seed = 0):
+    """Plays the batches of every setting which are not already in the summary file.
+
+    Parameters:
+    settings(iterable<tuple<int, int>>): The (grid_size, num_pokemon) settings to play.
+    games(int): The number of games to play for each setting.
+    batch_size(int): The number of games played in each task.
+    summary(str): The summary file the finished batches are added to.
+    workers(int): The number of worker processes. Uses one per CPU when not given.
+    seed(int): Seed of the first game of each setting.
+
+    Returns:
+    (dict<tuple<int, int, int, int>, dict>): The results of every batch of the run.
+    """
+    finished = load_summary(summary, batch_size, seed)
+    planned = [(grid_size, num_pokemon, batch, size)
+               for grid_size, num_pokemon in settings
+               for batch, size in enumerate(batch_sizes(games, batch_size))]
+    with ProcessPoolExecutor(max_workers = workers) as executor, \
+            open(summary, "a", encoding = "utf-8") as file:
+        futures = [executor.submit(play_batch, grid_size, num_pokemon, batch, batch_size, size, seed)
+                   for grid_size, num_pokemon, batch, size in planned
+                   if (grid_size, num_pokemon, batch, size) not in finished]
+        for future in as_completed(futures):
+            results = future.result()
+            finished[batch_key(results)] = results
+            file.write(json.dumps(results) + "\n")
+            file.flush()
+    #Leave out batches of earlier runs which played more games
+    return {key: finished[key] for key in planned}
+
+
+def win_rate_table(finished, settings):
+    """Adds up the finished batches of each setting.
+
+    The rate is games per second of worker time, the speed of one worker. With several
+    workers the run plays more games each second than this.
+
+    Parameters:
+    finished(dict<tuple<int, int, int, int>, dict>): The results of every finished batch.
+    settings(iterable<tuple<int, int>>): The settings to include.
+
+    Returns:
+    (list<str>): A heading line, then one line for each setting.
+    """
+    lines = [f"{'grid':>5} {'pokemon':>8} {'games':>9} {'win rate':>9} "
+             f"{'reveals':>8} {'guesses':>8} {'worker g/s':>10}"]
+    for grid_size, num_pokemon in settings:
+        totals = {"games": 0, "wins": 0, "reveals": 0, "guesses": 0, "seconds": 0}
+        for (grid, pokemon, _, _), results in finished.items():
+            if (grid, pokemon) == (grid_size, num_pokemon):
+                for key in totals:
+                    totals[key] += results[key]
+        games = max(totals["games"], 1)
+        lines.append(f"{grid_size:>5} {num_pokemon:>8} {totals['games']:>9} "
+                     f"{totals['wins'] / games:>9.1%} {totals['reveals'] / games:>8.1f} "
+                     f"{totals['guesses'] / games:>8.2f} "
+                     f"{totals['games'] / max(totals['seconds'], 1e-9):>10.0f}")
+    return lines
+
+
+def main():
+    """Runs the simulation and prints the win-rate table.
+    """
+    parser = argparse.ArgumentParser(description = "Simulate solver games to build win-rate tables.")
+    parser.add_argument("--games", type = int, default = GAMES, help = "games for each setting")
+    parser.add_argument("--batch-size", type = int, default = BATCH_SIZE, help = "games in each task")
+    parser.add_argument("--workers", type = int, default = None, help = "worker processes")
+    parser.add_argument("--summary", default = SUMMARY_FILE, help = "summary file to add results to")
+    parser.add_argument("--seed", type = int, default = 0, help = "seed of the first game")
+    parser.add_argument("--setting", type = int, nargs = 2, action = "append",
+                        metavar = ("GRID_SIZE", "NUM_POKEMON"), help = "setting to play, may be repeated")
+    args = parser.parse_args()
+
+    settings = [tuple(setting) for setting in args.setting] if args.setting else SETTINGS
+    finished = simulate(settings, args.games, args.batch_size, args.summary, args.workers, args.seed)
+    print("\n".join(win_rate_table(finished, settings)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""
+A headless solver which plays BoardModel games without any Tk objects.
+
+The solver keeps its own record of the cells it has seen, updated from the cells
+each move changes, so it never has to re-scan the game string. It applies the
+single-cell rules, then the subset rule between overlapping numbers, and falls back
+to guessing the cell least likely to hold a pokemon.
+
+Run with 'python solver.py [--grid-size N] [--pokemon N] [--games N] [--seed N] [--estimate]
+[--bitboard]'.
+"""
+import argparse
+from time import perf_counter
+from a3 import BoardModel, BitBoardModel, FLAG, neighbour_table
+
+#States of a cell as the solver knows it
+UNKNOWN_CELL = 0
+EXPOSED_CELL = 1
+POKEMON_CELL = 2
+
+
+class Solver(object):
+    """
+    Plays a game on a BoardModel using the information a player would have.
+    """
+    def __init__(self, model, exact = True):
+        """Initializes the Solver from the current state of the model.
+
+        Parameters:
+        model(BoardModel): The model of the game to play.
+        exact(bool): Whether guesses use the exact chances from the model, rather
+        than a quicker estimate from the numbers around each cell.
+        """
+        self._model = model
+        self._exact = exact
+        grid_size = model.get_grid_size()
+        self._neighbours = neighbour_table(grid_size)
+        self._state = bytearray(grid_size ** 2)
+        self._numbers = {}
+        self._unknown = set(range(grid_size ** 2))
+        #Only the number of pokemon is used, as it is shown to the player
+        self._pokemon_left = len(model.get_pokemon_locations())
+        #Exposed cells next to unknown cells, with their unknown neighbours and pokemon left
+        self._frontier = {}
+        #Exposed cells to re-check, and frontier cells changed since the subset rule was applied
+        self._dirty = set()
+        self._changed = set()
+        #Cells worked out to be safe or to hold pokemon, which are yet to be played
+        self._safe = set()
+        self._pokemon = set()
+        self.reveals = 0
+        self.guesses = 0
+
+        #A game part way through is read once, after which only changed cells are looked at
+        for index, character in enumerate(model.get_game()):
+            if character == FLAG:
+                self.mark_pokemon(index)
+            elif character.isdigit():
+                self.observe([(index, int(character))])
+
+    def observe(self, revealed):
+        """Records newly exposed cells, marking them and their neighbours to be re-checked.
+
+        Parameters:
+            revealed (list<tuple<int, int>>): Index and number of each exposed cell.
+        """
+        state = self._state
+        for index, number in revealed:
+            state[index] = EXPOSED_CELL
+            self._unknown.discard(index)
+            self._numbers[index] = number
+            self._dirty.add(index)
+            self._dirty.update(neighbour for neighbour in self._neighbours[index]
+                               if state[neighbour] == EXPOSED_CELL)
+
+    def mark_pokemon(self, index):
+        """Records a cell known to hold a pokemon.
+
+        Parameters:
+            index (int): Index of the cell.
+        """
+        state = self._state
+        state[index] = POKEMON_CELL
+        self._unknown.discard(index)
+        self._pokemon_left -= 1
+        self._dirty.update(neighbour for neighbour in self._neighbours[index]
+                           if state[neighbour] == EXPOSED_CELL)
+
+    def reveal(self, index):
+        """Selects a cell, as a left click would.
+
+        The flood is found and exposed in two steps, as in BoardModel.reveal_cells,
+        so the exposed cells can be passed straight to observe.
+
+        Parameters:
+            index (int): Index of the cell.
+
+        Returns:
+            (bool): False if the cell held a pokemon and the game is lost.
+        """
+        self.reveals += 1
+        if self._model.check_loss(index):
+            return False
+        revealed = self._model.flood_reveal(index)
+        self._model.expose_cells(revealed)
+        self.observe(revealed)
+        return True
+
+    def flag(self, index):
+        """Flags a cell known to hold a pokemon.
+
+        Parameters:
+            index (int): Index of the cell.
+        """
+        self._model.flag_cell(index)
+        self.mark_pokemon(index)
+
+    def check_cells(self):
+        """Updates the constraint of each dirty cell and applies the single-cell rules.
+
+        A number with no pokemon left around it makes its unknown neighbours safe, and
+        a number with as many pokemon left as unknown neighbours makes them all pokemon.
+        """
+        state = self._state
+        neighbours = self._neighbours
+        while self._dirty:
+            index = self._dirty.pop()
+            unknown = []
+            remaining = self._numbers[index]
+            for neighbour in neighbours[index]:
+                if state[neighbour] == UNKNOWN_CELL:
+                    unknown.append(neighbour)
+                elif state[neighbour] == POKEMON_CELL:
+                    remaining -= 1
+            if not unknown:
+                self._frontier.pop(index, None)
+                continue
+            if self._frontier.get(index) != (unknown, remaining):
+                self._frontier[index] = (unknown, remaining)
+                self._changed.add(index)
+            if remaining == 0:
+                self._safe.update(unknown)
+            elif remaining == len(unknown):
+                self._pokemon.update(unknown)
+
+    def check_subsets(self):
+        """Applies the subset rule to the frontier cells changed since it was last applied.
+
+        When the unknown neighbours of one number are all next to another number, the
+        rest of the other number's unknown neighbours hold the difference in pokemon.
+        """
+        changed, self._changed = self._changed, set()
+        frontier = self._frontier
+        for index in changed:
+            if index not in frontier:
+                continue
+            unknown, remaining = frontier[index]
+            nearby = set()
+            for cell in unknown:
+                nearby.update(self._neighbours[cell])
+            nearby.discard(index)
+            for other in nearby:
+                if other in frontier:
+                    other_unknown, other_remaining = frontier[other]
+                    self.apply_subset(unknown, remaining, other_unknown, other_remaining)
+                    self.apply_subset(other_unknown, other_remaining, unknown, remaining)
+
+    def apply_subset(self, inner, inner_remaining, outer, outer_remaining):
+        """Applies the subset rule to a pair of constraints.
+
+        Parameters:
+            inner (list<int>): Unknown neighbours of the first number.
+            inner_remaining (int): Pokemon left around the first number.
+            outer (list<int>): Unknown neighbours of the second number.
+            outer_remaining (int): Pokemon left around the second number.
+        """
+        if len(inner) >= len(outer):
+            return
+        inner_cells = set(inner)
+        if not inner_cells.issubset(outer):
+            return
+        rest = [cell for cell in outer if cell not in inner_cells]
+        pokemon = outer_remaining - inner_remaining
+        if pokemon == 0:
+            self._safe.update(rest)
+        elif pokemon == len(rest):
+            self._pokemon.update(rest)
+
+    def guess(self):
+        """Picks the unknown cell least likely to hold a pokemon.
+
+        The chances come from BoardModel.pokemon_probabilities when exact. Otherwise a
+        frontier cell is ranked by the highest share of pokemon left around its numbers,
+        and any other cell by the share of pokemon left in the unknown cells. A cell
+        which cannot hold a pokemon is not counted as a guess.
+
+        Returns:
+            (int): Index of the cell to select.
+        """
+        if self._exact:
+            frontier, other = self._model.pokemon_probabilities()
+            odds = {cell: chance for cell, chance in frontier.items()
+                    if self._state[cell] == UNKNOWN_CELL}
+        else:
+            other = self._pokemon_left / len(self._unknown)
+            odds = {}
+            for unknown, remaining in self._frontier.values():
+                share = remaining / len(unknown)
+                for cell in unknown:
+                    if odds.get(cell, -1) < share:
+                        odds[cell] = share
+        best = min(odds, key = odds.get) if odds else None
+        if best is None or odds[best] > other:
+            for cell in self._unknown:
+                if cell not in odds:
+                    best = cell
+                    break
+        if odds.get(best, other) > 0:
+            self.guesses += 1
+        return best
+
+    def next_move(self):
+        """Works out the next move to play.
+
+        Returns:
+            (tuple<int, bool>): Index of the cell, and True if it is to be flagged.
+            None if there are no unknown cells left.
+        """
+        state = self._state
+        while True:
+            while self._pokemon:
+                index = self._pokemon.pop()
+                if state[index] == UNKNOWN_CELL:
+                    return index, True
+            while self._safe:
+                index = self._safe.pop()
+                if state[index] == UNKNOWN_CELL:
+                    return index, False
+            if self._dirty:
+                self.check_cells()
+            elif self._changed:
+                self.check_subsets()
+            else:
+                break
+
+        if not self._unknown:
+            return None
+        #Once every pokemon is accounted for, or every unknown cell holds one, the rest follows
+        if self._pokemon_left == 0:
+            return next(iter(self._unknown)), False
+        if self._pokemon_left == len(self._unknown):
+            return next(iter(self._unknown)), True
+        return self.guess(), False
+
+    def play(self):
+        """Plays the game until it is won or lost.
+
+        Returns:
+            (bool): True if the game was won.
+        """
+        while not self._model.check_win():
+            move = self.next_move()
+            if move is None:
+                return False
+            index, is_pokemon = move
+            if is_pokemon:
+                self.flag(index)
+            elif not self.reveal(index):
+                return False
+        return True
+
+
+def play_game(grid_size, num_pokemon, seed = None, exact = True, engine = BoardModel):
+    """Plays one game with the solver.
+
+    Parameters:
+    grid_size(int): The grid size of the game.
+    num_pokemon(int): The number of pokemon in the game.
+    seed(int): Seed used to place the pokemon.
+    exact(bool): Whether guesses use the exact chances from the model.
+    engine(type): The BoardModel class to play the game on.
+
+    Returns:
+    (tuple<bool, int, int>): Whether the game was won, and the number of reveals and guesses.
+    """
+    solver = Solver(engine(grid_size, num_pokemon, seed), exact)
+    won = solver.play()
+    return won, solver.reveals, solver.guesses
+
+
+def run_games(grid_size, num_pokemon, seeds, exact = True, engine = BoardModel):
+    """Plays a game for each seed with the solver.
+
+    Parameters:
+    grid_size(int): The grid size of the games.
+    num_pokemon(int): The number of pokemon in each game.
+    seeds(iterable<int>): Seed of each game.
+    exact(bool): Whether guesses use the exact chances from the model.
+    engine(type): The BoardModel class to play the games on.
+
+    Returns:
+    (dict<str, float>): The number of games, wins, reveals and guesses, and the seconds taken.
+    """
+    results = {"games": 0, "wins": 0, "reveals": 0, "guesses": 0}
+    start = perf_counter()
+    for seed in seeds:
+        won, reveals, guesses = play_game(grid_size, num_pokemon, seed, exact, engine)
+        results["games"] += 1
+        results["wins"] += won
+        results["reveals"] += reveals
+        results["guesses"] += guesses
+    results["seconds"] = perf_counter() - start
+    return results
+
+
+def main():
+    """Plays a run of seeded games and reports the win rate and games per second.
+    """
+    parser = argparse.ArgumentParser(description = "Play games with the solver.")
+    parser.add_argument("--grid-size", type = int, default = 10, help = "grid size of each game")
+    parser.add_argument("--pokemon", type = int, default = 15, help = "pokemon in each game")
+    parser.add_argument("--games", type = int, default = 1000, help = "number of games to play")
+    parser.add_argument("--seed", type = int, default = 0, help = "seed of the first game")
+    parser.add_argument("--estimate", action = "store_true",
+                        help = "guess from estimated rather than exact chances")
+    parser.add_argument("--bitboard", action = "store_true",
+                        help = "play on BitBoardModel rather than BoardModel")
+    args = parser.parse_args()
+
+    results = run_games(args.grid_size, args.pokemon, range(args.seed, args.seed + args.games),
+                        not args.estimate, BitBoardModel if args.bitboard else BoardModel)
+    games = results["games"]
+    print(f"{games} games, {results['wins']} won ({results['wins'] / max(games, 1):.1%})")
+    print(f"{results['reveals'] / max(games, 1):.1f} reveals and "
+          f"{results['guesses'] / max(games, 1):.1f} guesses per game")
+    print(f"{games / max(results['seconds'], 1e-9):.0f} games per second")
+
+
+if __name__ == "__main__":
+    main()
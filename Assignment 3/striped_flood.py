@@ -0,0 +1,272 @@
+"""
+A parallel flood fill for zero regions on multi-million-cell boards.
+
+The board is split into horizontal stripes, one per worker, over layers held in
+multiprocessing.shared_memory: the cells the flood can pass through, the cells it
+has reached and the cells it makes visible. Each worker floods its own stripe from
+the cells it is given. When its queue runs dry it looks at the rows just outside its
+stripe, and carries on from any cells the neighbouring stripes have reached there in
+the meantime, for up to FLOOD_ROUNDS rounds, so a region winding across the borders
+does not need the pool to sync after every crossing. Each worker then reports the
+cells it reached on its first and last rows. The open cells next to those, across the
+stripe border, are handed to the stripes above and below as new starting cells,
+round after round, until no stripe reaches anything new.
+
+The cells found are the same as BoardModel.big_fun_search. Works with any model with
+get_counts and flagged_cells, including SparseBoardModel and MappedBoardModel, whose
+counts are built in full for each search.
+"""
+from multiprocessing import Pool, shared_memory
+from a3 import FLAG, UNEXPOSED, DIRECTION_OFFSETS
+
+#Maps adjacent pokemon counts to 1 for a count of 0 and 0 for any other count
+ZERO_BYTES = bytes.maketrans(bytes(range(256)), b"\x01" + bytes(255))
+#Rounds a worker floods from cells its neighbours reached before returning to the pool
+FLOOD_ROUNDS = 8
+
+#The shared layers of a worker, attached once when the worker starts
+_shared = {}
+
+
+def attach_layers(name, grid_size):
+    """Attaches a worker to the shared layers. Runs once in each worker process.
+
+    Parameters:
+        name (str): Name of the shared memory block.
+        grid_size (int): The grid size of the game.
+    """
+    memory = shared_memory.SharedMemory(name)
+    cells = grid_size ** 2
+    _shared.update(memory = memory, grid_size = grid_size, open = memory.buf[:cells],
+                   reached = memory.buf[cells:2 * cells],
+                   visible = memory.buf[2 * cells:3 * cells])
+
+
+def pull_border(first_row, end_row):
+    """Claims the open cells of a stripe next to cells the neighbouring stripes have
+    reached on the rows just outside it. Runs in a worker process.
+
+    Parameters:
+        first_row (int): First row of the stripe.
+        end_row (int): The row after the last row of the stripe.
+
+    Returns:
+        (list<int>): The cells claimed, marked as reached.
+    """
+    grid_size = _shared["grid_size"]
+    passable = _shared["open"]
+    reached = _shared["reached"]
+    claimed = []
+    for outside, inside in ((first_row - 1, first_row), (end_row, end_row - 1)):
+        if not 0 <= outside < grid_size:
+            continue
+        row = bytes(reached[outside * grid_size:(outside + 1) * grid_size])
+        col = row.find(1)
+        while col != -1:
+            for neighbour_col in range(max(col - 1, 0), min(col + 2, grid_size)):
+                neighbour = inside * grid_size + neighbour_col
+                if passable[neighbour] and not reached[neighbour]:
+                    reached[neighbour] = 1
+                    claimed.append(neighbour)
+            col = row.find(1, col + 1)
+    return claimed
+
+
+def flood_stripe(task):
+    """Floods one stripe from its starting cells. Runs in a worker process.
+
+    Each reached cell and its neighbours are marked visible, including neighbours
+    across the stripe border, which only ever changes a 0 to a 1. Two workers may
+    both claim a cell on a border, which only floods it twice.
+
+    Parameters:
+        task (tuple<int, int, list<int>>): First row, end row and starting cells of the
+        stripe.
+
+    Returns:
+        (tuple<list<int>, list<int>>): The newly reached cells on the first and last row.
+    """
+    first_row, end_row, starts = task
+    queue = [cell for cell in starts if not _shared["reached"][cell]]
+    for cell in queue:
+        _shared["reached"][cell] = 1
+    top = []
+    bottom = []
+    for flood_round in range(FLOOD_ROUNDS):
+        if flood_round:
+            queue = pull_border(first_row, end_row)
+            if not queue:
+                break
+        flood_queue(queue, first_row, end_row, top, bottom)
+    return top, bottom
+
+
+def flood_queue(queue, first_row, end_row, top, bottom):
+    """Floods a stripe from the claimed cells in a queue. Runs in a worker process.
+
+    Parameters:
+        queue (list<int>): Cells claimed as reached but not yet flooded from, emptied.
+        first_row (int): First row of the stripe.
+        end_row (int): The row after the last row of the stripe.
+        top (list<int>): Reached cells on the first row, added to.
+        bottom (list<int>): Reached cells on the last row, added to.
+    """
+    grid_size = _shared["grid_size"]
+    passable = _shared["open"]
+    reached = _shared["reached"]
+    visible = _shared["visible"]
+    lowest = first_row * grid_size
+    highest = end_row * grid_size
+    cells = grid_size ** 2
+    while queue:
+        node = queue.pop()
+        if node < lowest + grid_size:
+            top.append(node)
+        if node >= highest - grid_size:
+            bottom.append(node)
+        visible[node] = 1
+        col = node % grid_size
+        for row_offset, col_offset in DIRECTION_OFFSETS.values():
+            if not 0 <= col + col_offset < grid_size:
+                continue
+            neighbour = node + row_offset * grid_size + col_offset
+            if not 0 <= neighbour < cells:
+                continue
+            visible[neighbour] = 1
+            if (lowest <= neighbour < highest and passable[neighbour]
+                    and not reached[neighbour]):
+                reached[neighbour] = 1
+                queue.append(neighbour)
+
+
+class StripedFlood(object):
+    """
+    A pool of workers which flood zero regions of one grid size in parallel.
+    """
+    def __init__(self, grid_size, workers = 4):
+        """Initializes the StripedFlood, creating the shared layers and the workers.
+
+        Parameters:
+        grid_size(int): The grid size of the games to flood.
+        workers(int): The number of worker processes, and of stripes.
+        """
+        self._grid_size = grid_size
+        cells = grid_size ** 2
+        self._memory = shared_memory.SharedMemory(create = True, size = max(3 * cells, 1))
+        self._open = self._memory.buf[:cells]
+        self._layers = self._memory.buf[cells:3 * cells]
+        self._visible = self._memory.buf[2 * cells:3 * cells]
+        stripes = max(1, min(workers, grid_size))
+        bounds = [grid_size * stripe // stripes for stripe in range(stripes + 1)]
+        self._stripes = list(zip(bounds, bounds[1:]))
+        self._pool = Pool(stripes, attach_layers, (self._memory.name, grid_size))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stops the workers and frees the shared layers.
+        """
+        self._pool.close()
+        self._pool.join()
+        for view in (self._open, self._layers, self._visible):
+            view.release()
+        self._memory.close()
+        self._memory.unlink()
+
+    def stripe_of(self, row):
+        """Finds the stripe holding a row.
+
+        Parameters:
+            row (int): The row.
+
+        Returns:
+            (int): The number of the stripe.
+        """
+        for stripe, (first_row, end_row) in enumerate(self._stripes):
+            if first_row <= row < end_row:
+                return stripe
+
+    def border_starts(self, cells, row_step, starts):
+        """Adds the open cells across a stripe border from reached cells to the starts.
+
+        Parameters:
+            cells (list<int>): Reached cells on the first or last row of a stripe.
+            row_step (int): -1 to look at the row above, 1 for the row below.
+            starts (list<list<int>>): The starting cells of each stripe, added to.
+        """
+        grid_size = self._grid_size
+        for cell in cells:
+            row, col = divmod(cell, grid_size)
+            row += row_step
+            if not 0 <= row < grid_size:
+                continue
+            stripe = starts[self.stripe_of(row)]
+            for neighbour_col in range(max(col - 1, 0), min(col + 2, grid_size)):
+                neighbour = row * grid_size + neighbour_col
+                if self._open[neighbour]:
+                    stripe.append(neighbour)
+
+    def search(self, model, index):
+        """Finds the cells big_fun_search would turn visible, flooding in parallel.
+
+        Parameters:
+            model (BoardModel): The model to search.
+            index (int): Index of the currently selected cell.
+
+        Returns:
+            (list<int>): The cells to turn visible, in index order.
+        """
+        cells = self._grid_size ** 2
+        if model.get_grid_size() != self._grid_size or len(model.get_game()) != cells:
+            raise ValueError(f"StripedFlood for {cells} cells can not search a game of "
+                             f"{len(model.get_game())} cells")
+        counts = model.get_counts()
+        if model.get_game()[index] == FLAG or counts[index] != 0:
+            return [index]
+        passable = bytearray(counts.translate(ZERO_BYTES))
+        for cell in model.flagged_cells():
+            passable[cell] = 0
+        self._open[:] = passable
+        self._layers[:] = bytes(2 * cells)
+
+        starts = [[] for _ in self._stripes]
+        starts[self.stripe_of(index // self._grid_size)].append(index)
+        while any(starts):
+            tasks = [(first_row, end_row, stripe_starts)
+                     for (first_row, end_row), stripe_starts in zip(self._stripes, starts)]
+            starts = [[] for _ in self._stripes]
+            for top, bottom in self._pool.map(flood_stripe, tasks):
+                self.border_starts(top, -1, starts)
+                self.border_starts(bottom, 1, starts)
+
+        visible = bytes(self._visible)
+        found = []
+        cell = visible.find(1)
+        while cell != -1:
+            if cell != index:
+                found.append(cell)
+            cell = visible.find(1, cell + 1)
+        return found
+
+    def reveal_cells(self, model, index):
+        """Reveals the cells reveal_cells would, using a parallel flood.
+
+        Parameters:
+            model (BoardModel): The model to reveal cells of.
+            index (int): Index of the currently selected cell.
+
+        Returns:
+            (list<tuple<int, int>>): Index and number of each exposed cell.
+        """
+        game = model.get_game()
+        cells = self.search(model, index)
+        counts = model.get_counts()
+        if game[index] != FLAG and index not in cells:
+            cells.append(index)
+        revealed = [(cell, counts[cell]) for cell in cells if game[cell] == UNEXPOSED]
+        model.expose_cells(revealed)
+        return revealed
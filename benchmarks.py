@@ -0,0 +1,228 @@
+"""
+Benchmarks for the minesweeper engines in Assignment 1 (a1) and Assignment 3 (BoardModel
+and BitBoardModel).
+
+Sweeps grid sizes and pokemon densities, timing the core functions, single reveals,
+worst-case zero-region floods and full scripted games. Each result is written as one
+line of JSON, so runs can be compared to track speedups and catch regressions.
+
+Run with 'python benchmarks.py [--quick] [--output FILE]'.
+The a3 engines are skipped if a3 cannot be imported (it needs tkinter and Pillow).
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+from time import perf_counter
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "Assignment 1"))
+sys.path.insert(0, os.path.join(ROOT, "Assignment 3"))
+
+import a1
+
+try:
+    import a3
+except ImportError:
+    a3 = None
+
+GRID_SIZES = (10, 26, 100, 300)
+DENSITIES = (0.05, 0.15, 0.3)
+QUICK_GRID_SIZES = (10, 26)
+QUICK_DENSITIES = (0.15,)
+# Full games are only timed up to this grid size, as they play every cell
+FULL_GAME_MAX_GRID = 100
+SEED = 7030
+
+
+def time_call(func, setup=None, repeats=20):
+    """Times a function, calling setup before each call without timing it.
+
+    Parameters:
+        func (callable): Function to time. Given the value returned by setup, if any.
+        setup (callable): Function returning the argument for each call.
+        repeats (int): Number of timed calls.
+
+    Returns:
+        (tuple<float, float>): The best and median time of one call, in microseconds.
+    """
+    times = []
+    for _ in range(repeats):
+        argument = setup() if setup is not None else None
+        start = perf_counter()
+        if setup is not None:
+            func(argument)
+        else:
+            func()
+        times.append((perf_counter() - start) * 1e6)
+    return min(times), statistics.median(times)
+
+
+def scripted_actions(grid_size, pokemon_locations, rng):
+    """Builds the actions of a game that flags every pokemon and exposes every
+    other cell, in a random order, so it always ends in a win. Cells already
+    exposed by a flood are skipped when the game is played.
+
+    Parameters:
+        grid_size (int): Size of game.
+        pokemon_locations (iterable<int>): All Pokemon's locations.
+        rng (random.Random): Random number generator used to order the actions.
+
+    Returns:
+        (list<tuple<int, bool>>): Index of each action and whether it is a flag.
+    """
+    actions = [(index, index in pokemon_locations) for index in range(grid_size ** 2)]
+    rng.shuffle(actions)
+    return actions
+
+
+def bench_a1(grid_size, number_of_pokemons, repeats):
+    """Benchmarks the a1 functions on one board setting.
+
+    Parameters:
+        grid_size (int): Size of game.
+        number_of_pokemons (int): Number of pokemons on the board.
+        repeats (int): Number of timed calls of each benchmark.
+
+    Returns:
+        (dict<str, tuple<float, float>>): Best and median microseconds of each benchmark.
+    """
+    rng = random.Random(SEED)
+    pokemons = a1.generate_pokemons(grid_size, number_of_pokemons, rng)
+    game = a1.new_board(grid_size, pokemons)
+    safe = [index for index in range(grid_size ** 2) if index not in pokemons] or [0]
+    results = {}
+
+    results["generate_pokemons"] = time_call(
+        lambda: a1.generate_pokemons(grid_size, number_of_pokemons, rng), repeats=repeats)
+    results["number_at_cell"] = time_call(
+        lambda index: a1.number_at_cell(game, pokemons, grid_size, index),
+        lambda: rng.randrange(grid_size ** 2), repeats)
+    results["flag_cell"] = time_call(
+        lambda index: a1.flag_cell(game, index), lambda: rng.randrange(grid_size ** 2), repeats)
+    results["check_win"] = time_call(lambda: a1.check_win(game, pokemons), repeats=repeats)
+    results["big_fun_search"] = time_call(
+        lambda index: a1.big_fun_search(a1.new_board(grid_size, pokemons), grid_size, pokemons, index),
+        lambda: rng.choice(safe), repeats)
+    results["single_reveal"] = time_call(
+        lambda args: a1.expose_cells(args[0], a1.flood_reveal(args[0], grid_size, pokemons, args[1])),
+        lambda: (a1.new_board(grid_size, pokemons), rng.choice(safe)), repeats)
+
+    # Worst case: a board without pokemons is one zero region
+    empty = a1.generate_pokemons(grid_size, 0)
+    results["zero_region_flood"] = time_call(
+        lambda board: a1.expose_cells(board, a1.flood_reveal(board, grid_size, empty, 0)),
+        lambda: a1.new_board(grid_size, empty), max(1, repeats // 4))
+
+    def play(actions):
+        game = a1.new_board(grid_size, pokemons)
+        for index, flag in actions:
+            if game[index] != a1.UNEXPOSED:
+                continue
+            row, col = divmod(index, grid_size)
+            action = ("f " if flag else "") + a1.row_label(row) + str(col + 1)
+            game, _, outcome = a1.play_action(game, grid_size, pokemons, action)
+            if outcome == a1.GAME_WON:
+                break
+    if grid_size <= FULL_GAME_MAX_GRID:
+        results["full_game"] = time_call(
+            play, lambda: scripted_actions(grid_size, pokemons, rng), max(1, repeats // 4))
+    return results
+
+
+def bench_board_model(grid_size, number_of_pokemons, repeats, engine=None):
+    """Benchmarks BoardModel, or a subclass of it, on one board setting.
+
+    Parameters:
+        grid_size (int): Size of game.
+        number_of_pokemons (int): Number of pokemons on the board.
+        repeats (int): Number of timed calls of each benchmark.
+        engine (type): The BoardModel class to benchmark. BoardModel if not given.
+
+    Returns:
+        (dict<str, tuple<float, float>>): Best and median microseconds of each benchmark.
+    """
+    engine = engine or a3.BoardModel
+    rng = random.Random(SEED)
+    model = engine(grid_size, number_of_pokemons, rng)
+    pokemons = model.get_pokemon_locations()
+    safe = [index for index in range(grid_size ** 2) if index not in pokemons] or [0]
+    results = {}
+
+    def fresh_model():
+        board = engine(grid_size, 0)
+        board.set_pokemon_locations(pokemons)
+        return board
+
+    results["generate_pokemons"] = time_call(model.generate_pokemons, repeats=repeats)
+    results["number_at_cell"] = time_call(
+        model.number_at_cell, lambda: rng.randrange(grid_size ** 2), repeats)
+    results["flag_cell"] = time_call(model.flag_cell, lambda: rng.randrange(grid_size ** 2), repeats)
+    results["check_win"] = time_call(model.check_win, repeats=repeats)
+    results["big_fun_search"] = time_call(
+        lambda args: args[0].big_fun_search(args[1]), lambda: (fresh_model(), rng.choice(safe)), repeats)
+    results["single_reveal"] = time_call(
+        lambda args: args[0].reveal_cells(args[1]), lambda: (fresh_model(), rng.choice(safe)), repeats)
+
+    # Worst case: a board without pokemons is one zero region
+    results["zero_region_flood"] = time_call(
+        lambda board: board.reveal_cells(0), lambda: engine(grid_size, 0), max(1, repeats // 4))
+
+    def play(actions):
+        board = fresh_model()
+        for index, flag in actions:
+            if board.get_game()[index] != a3.UNEXPOSED:
+                continue
+            if flag:
+                board.flag_cell(index)
+            else:
+                board.reveal_cells(index)
+            if board.check_win():
+                break
+    if grid_size <= FULL_GAME_MAX_GRID:
+        results["full_game"] = time_call(
+            play, lambda: scripted_actions(grid_size, pokemons, rng), max(1, repeats // 4))
+    return results
+
+
+def main():
+    """Runs the benchmark sweep and writes the results as JSON lines.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the minesweeper engines.")
+    parser.add_argument("--quick", action="store_true", help="run a small sweep")
+    parser.add_argument("--repeats", type=int, default=20, help="timed calls per benchmark")
+    parser.add_argument("--output", default="-", help="file for the JSON lines results")
+    args = parser.parse_args()
+
+    grid_sizes = QUICK_GRID_SIZES if args.quick else GRID_SIZES
+    densities = QUICK_DENSITIES if args.quick else DENSITIES
+    engines = [("a1", bench_a1)]
+    if a3 is not None:
+        engines.append(("BoardModel", bench_board_model))
+        engines.append(("BitBoardModel", lambda *args: bench_board_model(*args, a3.BitBoardModel)))
+    else:
+        print("Skipping BoardModel and BitBoardModel: a3 could not be imported", file=sys.stderr)
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for engine, bench in engines:
+            for grid_size in grid_sizes:
+                for density in densities:
+                    number_of_pokemons = max(1, int(grid_size ** 2 * density))
+                    results = bench(grid_size, number_of_pokemons, args.repeats)
+                    for name, (best, median) in results.items():
+                        output.write(json.dumps({
+                            "engine": engine, "benchmark": name, "grid_size": grid_size,
+                            "density": density, "num_pokemon": number_of_pokemons,
+                            "best_us": round(best, 2), "median_us": round(median, 2),
+                        }) + "\n")
+                    output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()